@@ -0,0 +1,372 @@
+"""Offline end-to-end benchmark for the RSS-to-Discord pipeline.
+
+Replays feed XML through TelegramRSSBridge.check_rss with local stand-ins
+for everything the bridge talks to: the RSS endpoint, the Telethon client,
+the image host and Discord channels. Nothing touches the network. Each
+stand-in sleeps for a configurable latency so the numbers reflect how the
+bridge overlaps waiting, and ``--latency-scale 0`` leaves only CPU time.
+
+Feeds are built from the sample descriptions in descriptions.json, or
+replayed from recorded feeds with ``--recorded DIR`` (one ``<channel>.xml``
+per channel). Run from the repository root:
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --channels 1 50 500 --backlog 5000 --memory
+    python -m benchmarks.bench_pipeline --channels 50 --destinations 3
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from cogs.telegram import TelegramRSSBridge
+
+CORPUS_PATH = Path(__file__).with_name("descriptions.json")
+_MEDIA_RE = re.compile(r'undefined://telegram/channel/[A-Za-z_]+?_(\d+)')
+
+# Seconds each stand-in waits per call, roughly what the real services take
+LATENCY = {
+    "rss": 0.05,  # RSS bridge round trip
+    "get_messages": 0.04,  # one batched Telethon get_messages call
+    "download": 0.01,  # downloading one photo from Telegram
+    "upload": 0.05,  # uploading one image to the image host
+    "send": 0.01,  # one Discord message send
+}
+
+
+def channel_names(count: int):
+    """``count`` distinct channel names; media references can't carry digits in the name"""
+    names = []
+    for i in range(count):
+        suffix = ""
+        while True:
+            i, letter = divmod(i, 26)
+            suffix += chr(ord("a") + letter)
+            if not i:
+                break
+        names.append("channel" + suffix)
+    return names
+
+
+def build_feed(channel: str, corpus, count: int, first_id: int = 1) -> bytes:
+    """An RSS 2.0 feed of ``count`` posts, newest first, shaped like the bridge's output"""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for post_id in range(first_id + count - 1, first_id - 1, -1):
+        description = corpus[post_id % len(corpus)]
+        # Point every media reference at this channel with a unique message id
+        description = _MEDIA_RE.sub(
+            lambda m: f"undefined://telegram/channel/{channel}_{post_id * 10 + int(m.group(1)) % 10}",
+            description,
+        )
+        items.append(
+            "<item>"
+            f"<title>{escape(channel)} {post_id}</title>"
+            f"<description>{escape(description)}</description>"
+            f"<link>https://t.me/{channel}/{post_id}</link>"
+            f"<guid>https://t.me/{channel}/{post_id}</guid>"
+            f"<pubDate>{format_datetime(start + timedelta(minutes=post_id))}</pubDate>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{escape(channel)}</title><link>https://t.me/s/{channel}</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeRSSBridge:
+    """Stands in for the cloudscraper session; answers conditional GETs like the real bridge"""
+
+    def __init__(self, feeds, latency: float):
+        self.feeds = feeds
+        self.latency = latency
+        self.requests = 0
+
+    def get(self, url, headers=None, timeout=None):
+        # Called from a worker thread, so a blocking sleep is what the real request does too
+        self.requests += 1
+        time.sleep(self.latency)
+        channel = url.rsplit("/", 1)[-1]
+        body = self.feeds[channel]
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if headers and headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, body, {"ETag": etag})
+
+
+class FakeFile:
+    def __init__(self, size: int):
+        self.size = size
+
+
+class FakePhotoMedia:
+    photo = True
+
+
+class FakeTelegramMessage:
+    def __init__(self, channel, message_id: int, latency: float):
+        self.id = message_id
+        self.media = FakePhotoMedia()
+        self.latency = latency
+        self.image = hashlib.sha256(f"{channel}/{message_id}".encode()).digest() * 2048  # 64 KiB
+        self.file = FakeFile(len(self.image))
+
+    async def download_media(self, file=None):
+        await asyncio.sleep(self.latency)
+        return self.image
+
+
+class FakeTelegramClient:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def is_connected(self):
+        return True
+
+    async def connect(self):
+        pass
+
+    async def is_user_authorized(self):
+        return True
+
+    async def get_entity(self, name):
+        return name
+
+    async def get_messages(self, channel, ids):
+        self.calls += 1
+        await asyncio.sleep(self.latency["get_messages"])
+        return [FakeTelegramMessage(channel, message_id, self.latency["download"]) for message_id in ids]
+
+
+class FakeImageHost:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.uploads = 0
+
+    async def upload(self, image: bytes, filename: str = "image.jpg"):
+        self.uploads += 1
+        await asyncio.sleep(self.latency)
+        return f"https://img.invalid/{hashlib.sha256(image).hexdigest()[:16]}.jpg"
+
+
+class FakeDiscordMessage:
+    def __init__(self, message_id: int):
+        self.id = message_id
+
+
+class FakeDiscordChannel:
+    def __init__(self, channel_id: int, name: str, latency: float):
+        self.id = channel_id
+        self.name = name
+        self.latency = latency
+        self.sent = 0
+        self.embeds = 0
+
+    async def send(self, embed=None, embeds=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+        self.embeds += len(embeds) if embeds else embed is not None
+        return FakeDiscordMessage(self.sent)
+
+
+class FakeBot:
+    def __init__(self, channels):
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def wait_until_ready(self):
+        # The loop is driven by hand, so the cog's own task never gets going
+        await asyncio.Event().wait()
+
+
+class Harness:
+    """A TelegramRSSBridge wired to the stand-ins, living in a scratch directory"""
+
+    def __init__(self, feeds, latency, keys=None, destinations=1):
+        self.feeds = feeds
+        self.latency = latency
+        self.keys = keys or {}
+        self.destinations = destinations
+
+    async def __aenter__(self):
+        self.workdir = tempfile.TemporaryDirectory(prefix="bench_pipeline_")
+        self.previous_cwd = os.getcwd()
+        os.chdir(self.workdir.name)
+
+        names = list(self.feeds)
+        # Every channel fans out to ``destinations`` Discord channels
+        mappings = {
+            name: [str(1000 + i * self.destinations + d) for d in range(self.destinations)]
+            for i, name in enumerate(names)
+        }
+        Path("mappings.json").write_text(json.dumps(mappings))
+        Path("keys.json").write_text(json.dumps({
+            "telegram_api_id": 1,
+            "telegram_api_hash": "bench",
+            "rss_requests_per_minute": 1_000_000,
+            "posted_links_max_per_channel": 1_000_000,
+            "metrics_port": None,
+            **self.keys,
+        }))
+
+        self.discord_channels = {
+            int(channel_id): FakeDiscordChannel(int(channel_id), name, self.latency["send"])
+            for name, channel_ids in mappings.items()
+            for channel_id in channel_ids
+        }
+        self.bot = FakeBot(self.discord_channels)
+        self.cog = TelegramRSSBridge(self.bot)
+        self.cog.check_rss.cancel()
+        await self.cog.start_bridge()
+
+        self.rss = FakeRSSBridge(self.feeds, self.latency["rss"])
+        self.telegram = FakeTelegramClient(self.latency)
+        self.image_host = FakeImageHost(self.latency["upload"])
+        self.cog.create_scraper = lambda: self.rss
+        self.cog.tg_client = self.telegram
+        self.cog.upload_to_imgbb = self.image_host.upload
+        return self
+
+    async def __aexit__(self, *exc):
+        self.cog.sender.close()
+        self.cog.pending_posts.close()
+        self.cog.posted_links_journal.close()
+        os.chdir(self.previous_cwd)
+        self.workdir.cleanup()
+
+    async def tick(self):
+        """Run one check_rss pass with every channel due, returning the posts it sent"""
+        for schedule in self.cog.poll_scheduler.channels.values():
+            schedule.next_poll = 0
+        before = self.posts_sent()
+        await self.cog.check_rss()
+        # Polls outlive the tick that starts them; wait until their posts are out
+        await asyncio.gather(*self.cog.poll_tasks.values())
+        return self.posts_sent() - before
+
+    def posts_sent(self):
+        return int(self.cog.metrics.posts_sent.total())
+
+    def messages_sent(self):
+        return sum(channel.sent for channel in self.discord_channels.values())
+
+    def stage_report(self):
+        metrics = self.cog.metrics
+        lines = []
+        for label, histogram in (
+            ("feed fetch", metrics.feed_fetch),
+            ("feed parse", metrics.feed_parse),
+            ("format", metrics.format),
+            ("media lookup", metrics.media_resolve),
+            ("media upload", metrics.media_upload),
+            ("discord send", metrics.send),
+        ):
+            count, mean = histogram.summary()
+            if count:
+                lines.append(f"    {label:<13} {count:>7} × {mean * 1000:8.2f} ms")
+        return lines
+
+
+async def run_scenario(name, feeds, latency, steps, memory=False, keys=None, destinations=1):
+    """Time each ``(label, update)`` step; ``update`` may rewrite the feeds before its tick"""
+    async with Harness(feeds, latency, keys, destinations) as harness:
+        print(f"{name}: {len(feeds)} channels, {sum(body.count(b'<item>') for body in feeds.values())} entries")
+        for label, update in steps:
+            if update:
+                update(feeds)
+            if memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            posts = await harness.tick()
+            seconds = time.perf_counter() - start
+            peak = ""
+            if memory:
+                peak = f", peak {tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB"
+                tracemalloc.stop()
+            rate = f", {posts / seconds:.1f} posts/s" if posts else ""
+            print(f"  {label:<12} {seconds:7.3f}s, {posts} posts{rate}{peak}")
+        print(f"  requests: {harness.rss.requests} feed, {harness.telegram.calls} get_messages, "
+              f"{harness.image_host.uploads} uploads, {harness.messages_sent()} Discord messages")
+        print("  per stage:")
+        for line in harness.stage_report():
+            print(line)
+
+
+def load_recorded(directory: Path):
+    return {path.stem: path.read_bytes() for path in sorted(directory.glob("*.xml"))}
+
+
+async def main(args):
+    corpus = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    latency = {stage: seconds * args.latency_scale for stage, seconds in LATENCY.items()}
+    keys = {"batch_sends": args.batch, "embed_gallery": args.gallery}
+
+    if args.recorded:
+        feeds = load_recorded(args.recorded)
+        await run_scenario(f"recorded {args.recorded}", feeds, latency,
+                           [("cold", None), ("unchanged", None)], args.memory, keys, args.destinations)
+        return
+
+    for count in args.channels:
+        names = channel_names(count)
+        feeds = {name: build_feed(name, corpus, args.entries) for name in names}
+
+        def one_more(feeds):
+            # Each channel gains a single post, as on an ordinary poll
+            for name in feeds:
+                feeds[name] = build_feed(name, corpus, args.entries, first_id=2)
+
+        await run_scenario(f"{count} channels", feeds, latency, [
+            ("cold", None),
+            ("unchanged", None),
+            ("one new", one_more),
+        ], args.memory, keys, args.destinations)
+
+    feeds = {"backlog": build_feed("backlog", corpus, args.backlog)}
+    await run_scenario("cold-start backlog", feeds, latency, [("cold", None)], args.memory, keys,
+                       args.destinations)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 50, 500],
+                        help="mapped channel counts to run (default: 1 50 500)")
+    parser.add_argument("--entries", type=int, default=20, help="entries per feed (default: 20)")
+    parser.add_argument("--backlog", type=int, default=2000,
+                        help="entries in the cold-start backlog scenario (default: 2000)")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiply every stand-in latency, 0 for CPU time only (default: 1)")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace peak memory with tracemalloc (slows every step down)")
+    parser.add_argument("--batch", action="store_true", help="pack consecutive posts into shared messages")
+    parser.add_argument("--gallery", action="store_true", help="send extra images as an embed gallery")
+    parser.add_argument("--destinations", type=int, default=1,
+                        help="Discord channels each Telegram channel is mapped to (default: 1)")
+    parser.add_argument("--recorded", type=Path, help="replay <channel>.xml feeds from this directory")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
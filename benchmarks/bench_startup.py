@@ -0,0 +1,137 @@
+"""Startup benchmark for the Telegram bridge cog.
+
+Measures what stands between launching the bot and the gateway coming up:
+
+* importing cogs.telegram in a fresh interpreter, next to what importing
+  telethon, cloudscraper and feedparser eagerly would add;
+* constructing TelegramRSSBridge, which runs before the bot logs in;
+* start_bridge, which loads saved state once the bot is ready, along with
+  the longest the event loop was blocked meanwhile (a blocked loop delays
+  gateway heartbeats);
+* reloading the cog: unloading it, which saves its state, then
+  constructing and starting a fresh one over that state, as
+  ``reload_extension`` does.
+
+Gateway reconnects aren't measured: the poll loop keeps running across
+them and start_bridge is never called again.
+
+State files are generated for ``--channels`` channels so loading has
+realistic work to do. Run from the repository root:
+
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_pipeline import FakeBot, channel_names
+from bridge.dedup import LinkJournal, PostedLinks
+from bridge.media_cache import MediaCache
+from cogs.telegram import TelegramRSSBridge
+
+KEYS = {
+    "telegram_api_id": 1,
+    "telegram_api_hash": "bench",
+    "metrics_port": None,
+}
+
+
+def time_import(statement: str, repeat: int) -> float:
+    """Best wall time of ``statement`` in a fresh interpreter"""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    root = Path(__file__).resolve().parent.parent
+    return min(
+        float(subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeat)
+    )
+
+
+def write_state(channels, links_per_channel: int, media_entries: int):
+    Path("mappings.json").write_text(json.dumps({name: str(1000 + i) for i, name in enumerate(channels)}))
+    now = time.time()
+    links = PostedLinks(max_per_channel=links_per_channel)
+    for name in channels:
+        for post_id in range(links_per_channel):
+            links.add(name, f"https://t.me/{name}/{post_id}", now - post_id * 60)
+    Path("posted_links.json").write_text(json.dumps(links.to_dict()))
+    # A journal tail that hasn't been compacted yet
+    journal = LinkJournal("posted_links.journal")
+    for name in channels:
+        journal.append(name, f"https://t.me/{name}/{links_per_channel}", now)
+    journal.close()
+    media = MediaCache("media_cache.json")
+    for i in range(media_entries):
+        media.put(channels[i % len(channels)], i, f"{i:064x}", f"https://img.invalid/{i}.jpg")
+    media.save()
+
+
+async def max_loop_stall(task: "asyncio.Task", interval: float = 0.001) -> float:
+    """The longest the event loop went without running us while ``task`` ran"""
+    worst = 0.0
+    while not task.done():
+        before = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - before - interval)
+    await task
+    return worst
+
+
+async def measure_cog(args):
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as workdir:
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            channels = channel_names(args.channels)
+            write_state(channels, args.links, args.media)
+            bot = FakeBot({})
+
+            start = time.perf_counter()
+            cog = TelegramRSSBridge(bot, keys=dict(KEYS))
+            constructed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            stall = await max_loop_stall(asyncio.create_task(cog.start_bridge()))
+            loaded = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cog.cog_unload()
+            cog = TelegramRSSBridge(bot, keys=dict(KEYS))
+            await cog.start_bridge()
+            reload = time.perf_counter() - start
+
+            cog.cog_unload()
+        finally:
+            os.chdir(previous_cwd)
+
+    print(f"construct cog:        {constructed * 1000:8.2f} ms  (before login)")
+    print(f"start_bridge:         {loaded * 1000:8.2f} ms  (after ready, in the background)")
+    print(f"  longest loop stall: {stall * 1000:8.2f} ms")
+    print(f"reload cog:           {reload * 1000:8.2f} ms  (unload, construct and start_bridge)")
+
+
+def main(args):
+    print(f"{args.channels} channels, {args.links} remembered links each, {args.media} cached media")
+    bridge = time_import("import cogs.telegram", args.repeat)
+    heavy = time_import("import cogs.telegram, telethon, cloudscraper, feedparser", args.repeat)
+    print(f"import cogs.telegram: {bridge * 1000:8.2f} ms")
+    print(f"  deferred imports:   {(heavy - bridge) * 1000:8.2f} ms  (telethon, cloudscraper, feedparser)")
+    asyncio.run(measure_cog(args))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--channels", type=int, default=50, help="mapped channels (default: 50)")
+    parser.add_argument("--links", type=int, default=1000, help="remembered links per channel (default: 1000)")
+    parser.add_argument("--media", type=int, default=5000, help="cached media entries (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per import timing (default: 5)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,104 @@
+"""Microbenchmark for the feed description converter.
+
+Compares bridge.text.convert_description with the multi-regex pipeline it
+replaced on the sample descriptions in descriptions.json. Run from the
+repository root:
+
+    python -m benchmarks.bench_text
+"""
+import json
+import re
+import timeit
+from pathlib import Path
+
+from bridge.text import convert_description
+
+CORPUS_PATH = Path(__file__).with_name("descriptions.json")
+
+
+def legacy_clean_text(text):
+    """The per-post regex pipeline clean_text used to run"""
+    words = text.split()
+    cleaned_words = []
+    current_word = ''
+    for word in words:
+        if len(word) == 1 and word.isalpha():
+            current_word += word
+        else:
+            if current_word:
+                cleaned_words.append(current_word)
+                current_word = ''
+            cleaned_words.append(word)
+    if current_word:
+        cleaned_words.append(current_word)
+    text = ' '.join(cleaned_words)
+    text = re.sub(r'<a href="[^"]+\?q=%23([^"]+)">#[^<]+</a>', r'#\1', text)
+    text = re.sub(r'<a href="([^"]+)"[^>]*>([^<]+)</a>', lambda m: f'<{m.group(1)}>' if m.group(1) == m.group(2) else f'{m.group(2)} <{m.group(1)}>', text)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = text.replace('&amp;', '&')
+    emoji_pattern = (
+        r'['
+        r'\U0001F1E0-\U0001F1FF'
+        r'\U0001F300-\U0001F5FF'
+        r'\U0001F600-\U0001F64F'
+        r'\U0001F680-\U0001F6FF'
+        r'\U0001F700-\U0001F77F'
+        r'\U0001F780-\U0001F7FF'
+        r'\U0001F800-\U0001F8FF'
+        r'\U0001F900-\U0001F9FF'
+        r'\U0001FA00-\U0001FA6F'
+        r'\U0001FA70-\U0001FAFF'
+        r'\U00002702-\U000027B0'
+        r'\U000024C2-\U0001F251'
+        r']'
+    )
+    text = re.sub(fr'([^\s])({emoji_pattern})', r'\1 \2', text)
+    text = re.sub(fr'({emoji_pattern})([^\s])', r'\1 \2', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\n\s*\n+', '\n\n', text)
+    text = text.replace('—', '\n—\n')
+    text = re.sub(r'(\d{2}:\d{2} [AP]M)', r'\n\1', text)
+    return text.strip()
+
+
+def legacy_pipeline(content):
+    re.findall(r'<img[^>]+src="([^"]+)"[^>]*>', content)
+    re.search(r'Forwarded From <b><a href="([^"]+)">([^<]+)</a></b> \(([^)]+)\)', content)
+    clean_content = re.sub(r'Forwarded From.*?\)', '', content)
+    chars = len(clean_content.replace(" ", ""))
+    if clean_content.count(" ") > chars * 0.5:
+        clean_content = ''.join(clean_content.split())
+    return legacy_clean_text(clean_content)
+
+
+def current_pipeline(content):
+    return convert_description(content)
+
+
+def main(number=200):
+    corpus = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    corpus.sort(key=len)
+    total_chars = sum(len(text) for text in corpus)
+    print(f"{len(corpus)} descriptions, {total_chars} characters, {number} rounds")
+
+    results = {}
+    for name, pipeline in (("legacy", legacy_pipeline), ("current", current_pipeline)):
+        # Warm up once so import-time compilation isn't counted against either side
+        for text in corpus:
+            pipeline(text)
+        seconds = min(timeit.repeat(lambda: [pipeline(text) for text in corpus], number=number, repeat=3))
+        results[name] = seconds
+        per_post = seconds / (number * len(corpus)) * 1e6
+        print(f"{name:>8}: {seconds:.3f}s total, {per_post:.1f} µs/post")
+
+    print(f" speedup: {results['legacy'] / results['current']:.2f}x")
+
+    longest = corpus[-1]
+    print(f"longest post ({len(longest)} characters):")
+    for name, pipeline in (("legacy", legacy_pipeline), ("current", current_pipeline)):
+        seconds = min(timeit.repeat(lambda: pipeline(longest), number=number, repeat=3))
+        print(f"{name:>8}: {seconds / number * 1e6:.1f} µs/post")
+
+
+if __name__ == "__main__":
+    main()
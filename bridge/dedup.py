@@ -0,0 +1,153 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class PostedLinks:
+    """Per-channel record of links that have already been sent to Discord.
+
+    Links are kept in insertion order with the time they were posted, so
+    membership checks are O(1) and the oldest links can be dropped cheaply
+    once a channel exceeds its retention limits.
+    """
+
+    def __init__(self, max_per_channel: int = 1000, max_age_days: Optional[float] = 90,
+                 min_per_channel: int = 100):
+        self.max_per_channel = max_per_channel
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        # Never age out the newest links of a channel, otherwise posts still
+        # listed in a quiet channel's feed would be sent again
+        self.min_per_channel = min(min_per_channel, max_per_channel)
+        self._channels: Dict[str, "OrderedDict[str, float]"] = {}
+
+    def contains(self, channel: str, link: str) -> bool:
+        links = self._channels.get(channel)
+        return links is not None and link in links
+
+    def add(self, channel: str, link: str, posted_at: Optional[float] = None):
+        links = self._channels.setdefault(channel, OrderedDict())
+        links[link] = posted_at if posted_at is not None else time.time()
+        links.move_to_end(link)
+        while len(links) > self.max_per_channel:
+            links.popitem(last=False)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop links past the age limit, returning how many were removed"""
+        if not self.max_age:
+            return 0
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        removed = 0
+        for links in self._channels.values():
+            while len(links) > self.min_per_channel:
+                link, posted_at = next(iter(links.items()))
+                if posted_at >= cutoff:
+                    break
+                del links[link]
+                removed += 1
+        return removed
+
+    def ensure_channels(self, channels: Iterable[str]):
+        for channel in channels:
+            self._channels.setdefault(channel, OrderedDict())
+
+    def inherit(self, channel: str, source: str):
+        """Give ``channel`` a copy of ``source``'s links if it has none of its own"""
+        if not self._channels.get(channel) and source in self._channels:
+            self._channels[channel] = OrderedDict(self._channels[source])
+
+    def forget(self, channel: str) -> bool:
+        return self._channels.pop(channel, None) is not None
+
+    def channel_size(self, channel: str) -> int:
+        return len(self._channels.get(channel, ()))
+
+    def __len__(self):
+        return sum(len(links) for links in self._channels.values())
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {channel: dict(links) for channel, links in self._channels.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict, **kwargs) -> "PostedLinks":
+        """Build a store from saved data.
+
+        Accepts both the current ``{channel: {link: posted_at}}`` layout and the
+        old ``{channel: [link, ...]}`` lists, which are migrated in order.
+        """
+        store = cls(**kwargs)
+        now = time.time()
+        for channel, links in data.items():
+            if isinstance(links, list):
+                # The old lists carry no timestamps; treat them as posted now,
+                # keeping their relative order
+                links = {link: now - (len(links) - i) * 1e-3 for i, link in enumerate(links)}
+            for link, posted_at in sorted(links.items(), key=lambda item: item[1]):
+                store.add(channel, link, posted_at)
+        store.prune(now)
+        return store
+
+
+class LinkJournal:
+    """Append-only log of posted links sitting next to a PostedLinks snapshot.
+
+    Recording a post appends one short line instead of rewriting the whole
+    snapshot. On startup the journal is replayed over the snapshot, and
+    ``compact`` folds it back into a fresh snapshot.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pending = 0
+        self._file = None
+
+    def append(self, channel: str, link: str, posted_at: float):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps([channel, link, posted_at]) + "\n")
+        # Flushing hands the line to the OS, so it survives the bot crashing
+        self._file.flush()
+        self.pending += 1
+
+    def read(self) -> List[Tuple[str, str, float]]:
+        """The journaled ``(channel, link, posted_at)`` entries"""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    channel, link, posted_at = json.loads(line)
+                except ValueError:
+                    # A crash mid-write can leave a partial last line behind
+                    continue
+                entries.append((channel, link, posted_at))
+        return entries
+
+    def replay(self, store: PostedLinks, entries: Optional[List[Tuple[str, str, float]]] = None) -> int:
+        """Apply journaled links (``entries``, if already read) to ``store``, returning how many there were"""
+        if entries is None:
+            entries = self.read()
+        for channel, link, posted_at in entries:
+            store.add(channel, link, posted_at)
+        self.pending = len(entries)
+        return len(entries)
+
+    def compact(self, store: PostedLinks, snapshot_path: str):
+        """Write ``store`` to ``snapshot_path`` and empty the journal"""
+        tmp_path = snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(store.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, snapshot_path)
+
+        self.close()
+        open(self.path, "w").close()
+        self.pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
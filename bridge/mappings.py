@@ -0,0 +1,65 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Destination:
+    """A Discord channel, or a thread in one, that a Telegram channel is posted to"""
+
+    channel_id: int
+    thread_id: Optional[int] = None
+    # Crosspost from announcement channels; turn off to keep posts local to one server
+    publish: bool = True
+
+    @property
+    def target_id(self) -> int:
+        """The id of what messages are actually sent to"""
+        return self.thread_id or self.channel_id
+
+    def dedup_key(self, source: str) -> str:
+        """Key of this destination's links in the dedup store"""
+        return f"{source}:{self.target_id}"
+
+
+def parse_destination(value) -> Destination:
+    if isinstance(value, dict):
+        thread = value.get("thread")
+        return Destination(
+            channel_id=int(value["channel"]),
+            thread_id=int(thread) if thread else None,
+            publish=bool(value.get("publish", True)),
+        )
+    return Destination(int(value))
+
+
+def parse_mappings(raw: dict) -> Dict[str, List[Destination]]:
+    """Read mappings.json, where each Telegram channel maps to one or more destinations.
+
+    A destination is a Discord channel id, or an object with ``channel`` and
+    the optional ``thread`` and ``publish`` keys; a list of them fans the
+    channel out to all of them::
+
+        {
+            "furcationland": "1368341427599179817",
+            "furpocalypseinc": [
+                "1368361052936339476",
+                {"channel": "1368368795374190592", "thread": "1368368795374190600", "publish": false}
+            ]
+        }
+
+    Entries that can't be read are logged and skipped.
+    """
+    mappings = {}
+    for source, value in raw.items():
+        destinations = []
+        for item in value if isinstance(value, list) else [value]:
+            try:
+                destinations.append(parse_destination(item))
+            except (KeyError, TypeError, ValueError) as e:
+                log.error("invalid destination source=%s value=%r error=%r", source, item, str(e))
+        if destinations:
+            mappings[source] = destinations
+    return mappings
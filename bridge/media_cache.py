@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class MediaCache:
+    """Maps Telegram media to already-hosted image URLs.
+
+    Entries are reachable both by ``(channel, message_id)`` and by a content
+    hash of the media, so a repost or forward of the same picture resolves
+    without another download or upload. Entries expire after ``ttl`` seconds
+    and the least recently used ones are evicted past ``max_entries``.
+    """
+
+    def __init__(self, path: str, ttl_days: float = 30, max_entries: int = 5000):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.dirty = False
+        self._write_lock = threading.Lock()
+        self._by_message: "OrderedDict[str, list]" = OrderedDict()
+        self._by_hash: "OrderedDict[str, list]" = OrderedDict()
+
+    @staticmethod
+    def message_key(channel: str, message_id: int) -> str:
+        return f"{channel.lower()}/{message_id}"
+
+    def _get(self, table: "OrderedDict[str, list]", key: str) -> Optional[str]:
+        item = table.get(key)
+        if item is None:
+            return None
+        url, stored_at = item
+        if time.time() - stored_at > self.ttl:
+            del table[key]
+            self.dirty = True
+            return None
+        table.move_to_end(key)
+        return url
+
+    def _put(self, table: "OrderedDict[str, list]", key: str, url: str, stored_at: float):
+        table[key] = [url, stored_at]
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+        self.dirty = True
+
+    def get_message(self, channel: str, message_id: int) -> Optional[str]:
+        return self._get(self._by_message, self.message_key(channel, message_id))
+
+    def get_hash(self, digest: str) -> Optional[str]:
+        return self._get(self._by_hash, digest)
+
+    def put(self, channel: str, message_id: int, digest: Optional[str], url: str):
+        now = time.time()
+        self._put(self._by_message, self.message_key(channel, message_id), url, now)
+        if digest:
+            self._put(self._by_hash, digest, url, now)
+
+    def __len__(self):
+        return len(self._by_message)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        cutoff = time.time() - self.ttl
+        for name, table in (("messages", self._by_message), ("hashes", self._by_hash)):
+            items = sorted(data.get(name, {}).items(), key=lambda item: item[1][1])
+            for key, (url, stored_at) in items[-self.max_entries:]:
+                if stored_at >= cutoff:
+                    table[key] = [url, stored_at]
+
+    def snapshot(self) -> Optional[dict]:
+        """A copy of the entries to ``write``, or None if nothing changed since the last one"""
+        if not self.dirty:
+            return None
+        self.dirty = False
+        # Entries are replaced rather than mutated, so shallow copies are enough
+        return {"messages": dict(self._by_message), "hashes": dict(self._by_hash)}
+
+    def write(self, data: dict):
+        """Write a snapshot to disk; safe to run in a worker thread"""
+        try:
+            with self._write_lock:
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+        except Exception:
+            self.dirty = True
+            raise
+
+    def save(self):
+        data = self.snapshot()
+        if data is not None:
+            self.write(data)
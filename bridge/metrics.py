@@ -0,0 +1,179 @@
+import bisect
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+log = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Latency buckets in seconds, from a cached lookup up to a slow upload
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + body + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def total(self, **labels) -> float:
+        """Sum of every series that carries ``labels``, whatever its other labels"""
+        wanted = set(_labels(labels))
+        return sum(value for key, value in self.values.items() if wanted.issubset(key))
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, labels, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[_labels(labels)] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., sum, count]
+        self.values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [0] * (len(self.buckets) + 2)
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self) -> Tuple[int, float]:
+        """Total observations and their mean across all label sets"""
+        count = sum(series[-1] for series in self.values.values())
+        total = sum(series[-2] for series in self.values.values())
+        return int(count), (total / count if count else 0.0)
+
+    def samples(self):
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield self.name + "_bucket", labels + (("le", repr(float(bound))),), cumulative
+            yield self.name + "_bucket", labels + (("le", "+Inf"),), series[-1]
+            yield self.name + "_sum", labels, series[-2]
+            yield self.name + "_count", labels, series[-1]
+
+
+class Registry:
+    """A small in-process metrics registry rendered in Prometheus' text format"""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._register(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run ``collector`` before every render, e.g. to refresh gauges"""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                log.exception("metrics collector failed")
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(registry: Registry, host: str, port: int):
+    """Serve ``registry`` at http://host:port/metrics, returning the runner to clean up later"""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    log.info("metrics endpoint listening host=%s port=%s", host, port)
+    return runner
+
+
+class BridgeMetrics:
+    """Every metric the Telegram bridge records, in one registry"""
+
+    def __init__(self):
+        self.registry = registry = Registry()
+        self.feed_fetch = registry.histogram("bridge_feed_fetch_seconds", "Time to download a channel's RSS feed")
+        self.feed_parse = registry.histogram("bridge_feed_parse_seconds", "Time to parse a downloaded feed")
+        self.feed_unchanged = registry.counter("bridge_feed_unchanged_total", "Polls skipped because the feed hadn't changed")
+        self.poll_errors = registry.counter("bridge_poll_errors_total", "Polls that failed outright")
+        self.format = registry.histogram("bridge_format_seconds", "Time to turn an entry into an embed")
+        self.media_resolve = registry.histogram("bridge_media_resolve_seconds", "Time for a batched get_messages call")
+        self.media_upload = registry.histogram("bridge_media_upload_seconds", "Time to download and re-host one image")
+        self.media_cache_hits = registry.counter("bridge_media_cache_hits_total", "Media resolved from the URL cache")
+        self.send = registry.histogram("bridge_discord_send_seconds", "Discord message send latency")
+        self.publish = registry.histogram("bridge_discord_publish_seconds", "Discord crosspost latency")
+        self.posts_sent = registry.counter("bridge_posts_sent_total", "Posts delivered to Discord")
+        self.send_errors = registry.counter("bridge_send_errors_total", "Posts that failed to send")
+        self.dedup_size = registry.gauge("bridge_posted_links", "Links held in the dedup store")
+        self.backlog = registry.gauge("bridge_send_backlog", "Messages waiting in a channel's send queue")
+        self.pending = registry.gauge("bridge_pending_posts", "Posts held for moderators")
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    link TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    post_date TEXT NOT NULL,
+    embed TEXT NOT NULL,
+    UNIQUE (channel, link)
+);
+CREATE INDEX IF NOT EXISTS pending_channel_date ON pending (channel, post_date, id);
+"""
+
+
+class PendingStore:
+    """Queue of posts held back for moderators to publish, kept in SQLite.
+
+    Posts are the same dicts the bridge has always used
+    (``link``, ``channel_id``, ``post_date``, ``embed_dict``). Every operation
+    is a single indexed transaction, so the queue can grow to thousands of
+    posts without any call touching more rows than it returns. The methods
+    block; call them through ``asyncio.to_thread`` from the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            # WAL keeps readers (like the pending listing) from blocking writers
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def _post(row) -> dict:
+        return {
+            "link": row["link"],
+            "channel_id": row["channel_id"],
+            "post_date": row["post_date"],
+            "embed_dict": json.loads(row["embed"]),
+        }
+
+    def enqueue(self, channel: str, post: dict) -> bool:
+        """Add a post to a channel's queue; returns False if it was already queued"""
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO pending (channel, link, channel_id, post_date, embed) VALUES (?, ?, ?, ?, ?)",
+                (channel, post["link"], str(post["channel_id"]), post["post_date"], json.dumps(post["embed_dict"])),
+            )
+            return cursor.rowcount > 0
+
+    def remove(self, channel: str, links: List[str]) -> int:
+        """Drop posts from a channel's queue once they've been published"""
+        with self._lock, self._db:
+            cursor = self._db.executemany(
+                "DELETE FROM pending WHERE channel = ? AND link = ?", [(channel, link) for link in links]
+            )
+            return cursor.rowcount
+
+    def page(self, channel: str, offset: int, limit: int) -> List[dict]:
+        """Posts of a channel in publishing order, without removing them"""
+        if limit < 1:
+            # SQLite reads a negative LIMIT as no limit at all
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM pending WHERE channel = ? ORDER BY post_date, id LIMIT ? OFFSET ?",
+                (channel, limit, offset),
+            ).fetchall()
+        return [self._post(row) for row in rows]
+
+    def count(self, channel: Optional[str] = None) -> int:
+        with self._lock:
+            if channel is None:
+                return self._db.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM pending WHERE channel = ?", (channel,)).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Queue length of every channel that has pending posts"""
+        with self._lock:
+            rows = self._db.execute("SELECT channel, COUNT(*) FROM pending GROUP BY channel ORDER BY channel").fetchall()
+        return {channel: count for channel, count in rows}
+
+    def clear(self, channel: str) -> int:
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM pending WHERE channel = ?", (channel,)).rowcount
+
+    def import_json(self, json_path: str) -> int:
+        """Move posts from the old pending_posts.json into the store.
+
+        The file is renamed afterwards so the import only ever runs once.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        imported = 0
+        for channel, posts in data.items():
+            for post in posts:
+                imported += self.enqueue(channel, post)
+        os.replace(json_path, json_path + ".migrated")
+        return imported
+
+    def close(self):
+        with self._lock:
+            self._db.close()
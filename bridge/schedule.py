@@ -0,0 +1,146 @@
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass
+class ChannelSchedule:
+    next_poll: float
+    interval: float
+    failures: int = 0
+    last_post: Optional[float] = None
+    # Median gap between the channel's recent posts, in seconds
+    post_gap: Optional[float] = None
+    # Newest first; polls only see the feed back to the first known post, so
+    # the history is built up across polls
+    recent_posts: List[float] = field(default_factory=list)
+    last_error: Optional[str] = None
+    # New posts arrive through Telegram updates, so polling only reconciles
+    pushed: bool = False
+
+
+@dataclass
+class PollScheduler:
+    """Decides when each mapped channel's feed is fetched next.
+
+    A channel is polled at ``activity_factor`` times the larger of its usual
+    gap between posts and the time since its last post, clamped to
+    ``[min_interval, max_interval]``. Busy channels are therefore checked
+    every minute or so while quiet ones drift towards the maximum. Failing
+    channels back off exponentially, every interval gets some jitter so
+    channels don't bunch up, and a token bucket caps the total number of
+    requests sent to the RSS bridge per minute. Channels whose posts are
+    pushed by Telegram are only polled every ``reconcile_interval``.
+    """
+
+    min_interval: float = 60
+    max_interval: float = 1800
+    default_interval: float = 300
+    activity_factor: float = 0.1
+    requests_per_minute: float = 30
+    jitter: float = 0.1
+    reconcile_interval: float = 3600
+    # Post times remembered per channel to learn its posting gap from
+    history: int = 20
+    channels: Dict[str, ChannelSchedule] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._tokens = self.requests_per_minute
+        self._refilled_at = time.monotonic()
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def set_channels(self, names: Iterable[str]):
+        """Track exactly ``names``, spreading the first poll of new channels out a little"""
+        now = time.time()
+        names = list(names)
+        for name in names:
+            if name not in self.channels:
+                self.channels[name] = ChannelSchedule(
+                    next_poll=now + random.uniform(0, self.min_interval * self.jitter),
+                    interval=self.default_interval,
+                )
+        for name in set(self.channels) - set(names):
+            del self.channels[name]
+
+    def set_pushed(self, names: Iterable[str], pushed: bool = True):
+        """Mark channels whose new posts arrive as Telegram updates"""
+        for name in names:
+            schedule = self.channels.get(name)
+            if schedule is not None:
+                schedule.pushed = pushed
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(
+            self.requests_per_minute,
+            self._tokens + (now - self._refilled_at) * self.requests_per_minute / 60,
+        )
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def refund(self):
+        """Give back the token of a due channel that turned out not to need a request"""
+        self._tokens = min(self.requests_per_minute, self._tokens + 1)
+
+    def due(self, now: Optional[float] = None, busy: Iterable[str] = ()) -> List[str]:
+        """Channels to poll right now, most overdue first, within the request budget.
+
+        Channels in ``busy`` are still working through their previous poll and are left out.
+        """
+        now = now if now is not None else time.time()
+        busy = set(busy)
+        overdue = sorted(
+            (schedule.next_poll, name)
+            for name, schedule in self.channels.items()
+            if schedule.next_poll <= now and name not in busy
+        )
+        due = []
+        for _, name in overdue:
+            if not self._take_token():
+                break
+            due.append(name)
+        return due
+
+    def record_success(self, name: str, post_times: Iterable[float] = ()):
+        """Reschedule a channel after a poll, learning from its posts' timestamps"""
+        schedule = self.channels.get(name)
+        if schedule is None:
+            return
+        now = time.time()
+        times = sorted(set(schedule.recent_posts).union(post_times), reverse=True)[:self.history]
+        schedule.recent_posts = times
+        if times:
+            schedule.last_post = max(times[0], schedule.last_post or 0)
+        if len(times) > 1:
+            gaps = sorted(newer - older for newer, older in zip(times, times[1:]))
+            schedule.post_gap = gaps[len(gaps) // 2]
+
+        quiet_for = now - schedule.last_post if schedule.last_post else None
+        activity = max(filter(None, (schedule.post_gap, quiet_for)), default=None)
+        if schedule.pushed:
+            schedule.interval = self.reconcile_interval
+        else:
+            if activity is None:
+                interval = self.default_interval
+            else:
+                interval = activity * self.activity_factor
+            schedule.interval = min(max(interval, self.min_interval), self.max_interval)
+        schedule.failures = 0
+        schedule.last_error = None
+        schedule.next_poll = now + self._jittered(schedule.interval)
+
+    def record_failure(self, name: str, error: Optional[str] = None):
+        """Back off a channel whose feed couldn't be fetched, or that has nowhere to post"""
+        schedule = self.channels.get(name)
+        if schedule is None:
+            return
+        schedule.failures += 1
+        schedule.last_error = error
+        backoff = min(schedule.interval * 2 ** schedule.failures, self.max_interval)
+        schedule.next_poll = time.time() + self._jittered(backoff)
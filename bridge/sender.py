@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import discord
+
+from bridge.metrics import Histogram
+
+log = logging.getLogger(__name__)
+
+# Discord's limits for the embeds of a single message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+class SendScheduler:
+    """Outbound message queues, one per Discord channel.
+
+    Each destination has its own worker, so a backlog in one channel never
+    holds up another. Pacing is left to py-cord's HTTP client, which already
+    tracks Discord's per-route rate-limit buckets from the response headers
+    and waits them out; the scheduler only retries sends that still come
+    back as 429 using the ``Retry-After`` the API hands us.
+
+    Crossposts (``message.publish()``) go through a second queue per channel,
+    since Discord limits them separately to ``crosspost_limit`` per
+    ``crosspost_window`` seconds.
+
+    With ``batch`` set, messages that are only embeds and sit next to each
+    other in a channel's queue are packed into one message, as far as
+    Discord's 10 embed and 6000 character limits allow. Messages are only
+    packed with others that share their ``publish`` flag. If Discord rejects
+    a packed message, its parts are sent one at a time, so only a bad part
+    fails.
+
+    ``send_latency`` and ``publish_latency`` histograms, if given, time each
+    call including any 429 retries.
+    """
+
+    def __init__(self, crosspost_limit: int = 10, crosspost_window: float = 3600, max_retries: int = 3,
+                 send_latency: Optional[Histogram] = None, publish_latency: Optional[Histogram] = None,
+                 batch: bool = False):
+        self.crosspost_limit = crosspost_limit
+        self.crosspost_window = crosspost_window
+        self.max_retries = max_retries
+        self._send_queues: Dict[int, asyncio.Queue] = {}
+        self._publish_queues: Dict[int, asyncio.Queue] = {}
+        self._workers: Dict[tuple, asyncio.Task] = {}
+        self._crossposts: Dict[int, Deque[float]] = {}
+        self.send_latency = send_latency
+        self.publish_latency = publish_latency
+        self.batch = batch
+
+    def _observe(self, histogram: Optional[Histogram], start: float, channel):
+        if histogram is not None:
+            histogram.observe(time.perf_counter() - start, channel=channel.name)
+
+    def crosspost_budget(self, channel_id: int) -> int:
+        """How many more messages can be published in a channel right now"""
+        recent = self._crossposts.setdefault(channel_id, deque())
+        cutoff = time.monotonic() - self.crosspost_window
+        while recent and recent[0] < cutoff:
+            recent.popleft()
+        return max(self.crosspost_limit - len(recent), 0)
+
+    def backlog(self, channel_id: int) -> int:
+        queue = self._send_queues.get(channel_id)
+        return queue.qsize() if queue else 0
+
+    def _queue(self, queues: Dict[int, asyncio.Queue], kind: str, channel) -> asyncio.Queue:
+        queue = queues.get(channel.id)
+        if queue is None:
+            queue = queues[channel.id] = asyncio.Queue()
+        worker = self._workers.get((kind, channel.id))
+        if worker is None or worker.done():
+            run = self._send_worker if kind == "send" else self._publish_worker
+            self._workers[(kind, channel.id)] = asyncio.create_task(run(channel, queue))
+        return queue
+
+    def send(self, channel, publish: bool = False, **kwargs) -> "asyncio.Future[discord.Message]":
+        """Queue a message for ``channel``; the returned future resolves once it's sent.
+
+        With ``publish`` the message is also crossposted afterwards, if the
+        channel's crosspost budget allows it.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue(self._send_queues, "send", channel).put_nowait((kwargs, publish, future))
+        return future
+
+    async def _with_retries(self, call):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await call()
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == self.max_retries:
+                    raise
+                retry_after = 1.0
+                response = getattr(e, "response", None)
+                if response is not None:
+                    retry_after = float(response.headers.get("Retry-After", retry_after))
+                await asyncio.sleep(retry_after)
+
+    @staticmethod
+    def _embeds(kwargs: dict) -> Optional[List[discord.Embed]]:
+        """The embeds of a message that could share a send with others, else None"""
+        if set(kwargs) == {"embed"}:
+            return [kwargs["embed"]]
+        if set(kwargs) == {"embeds"}:
+            return list(kwargs["embeds"])
+        return None
+
+    def _take_batch(self, first, queue: asyncio.Queue):
+        """Pack queued messages that can go out together with ``first``.
+
+        Returns the message kwargs, the ``(kwargs, future)`` parts it's made
+        of, and the item that didn't fit, if one was taken off the queue.
+        """
+        kwargs, publish, future = first
+        embeds = self._embeds(kwargs) if self.batch else None
+        if embeds is None:
+            return kwargs, [(kwargs, future)], None
+        chars = sum(len(embed) for embed in embeds)
+        parts = [(kwargs, future)]
+        while not queue.empty():
+            item = queue.get_nowait()
+            more = self._embeds(item[0])
+            more_chars = sum(len(embed) for embed in more) if more is not None else 0
+            if (
+                more is None
+                or item[1] != publish
+                or len(embeds) + len(more) > MAX_EMBEDS
+                or chars + more_chars > MAX_EMBED_CHARS
+            ):
+                return {"embeds": embeds}, parts, item
+            embeds += more
+            chars += more_chars
+            parts.append((item[0], item[2]))
+        return {"embeds": embeds}, parts, None
+
+    async def _deliver(self, channel, kwargs: dict, parts: list, publish: bool):
+        """Send one message and settle the futures of the ``parts`` it's made of"""
+        futures = [future for _, future in parts]
+        start = time.perf_counter()
+        try:
+            message = await self._with_retries(lambda: channel.send(**kwargs))
+            self._observe(self.send_latency, start, channel)
+        except Exception as e:
+            if len(parts) > 1 and isinstance(e, discord.HTTPException) and e.status != 429:
+                # Probably one bad part (say an image URL Discord won't take); don't let it sink the rest
+                log.warning("batched send failed, sending parts separately channel=%s parts=%d status=%s error=%r",
+                            channel.name, len(parts), e.status, str(e))
+                for part in parts:
+                    await self._deliver(channel, part[0], [part], publish)
+                return
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future in futures:
+            if not future.done():
+                future.set_result(message)
+        if publish:
+            self._queue(self._publish_queues, "publish", channel).put_nowait(message)
+
+    async def _send_worker(self, channel, queue: asyncio.Queue):
+        held = None
+        while True:
+            item = held or await queue.get()
+            kwargs, parts, held = self._take_batch(item, queue)
+            try:
+                await self._deliver(channel, kwargs, parts, item[1])
+            finally:
+                for _ in parts:
+                    queue.task_done()
+
+    async def _publish_worker(self, channel, queue: asyncio.Queue):
+        while True:
+            message = await queue.get()
+            try:
+                if not self.crosspost_budget(channel.id):
+                    log.warning("crosspost limit reached channel=%s message=%s", channel.name, message.id)
+                    continue
+                self._crossposts[channel.id].append(time.monotonic())
+                start = time.perf_counter()
+                await self._with_retries(message.publish)
+                self._observe(self.publish_latency, start, channel)
+                log.info("published channel=%s message=%s", channel.name, message.id)
+            except discord.Forbidden:
+                log.warning("missing permission to publish channel=%s", channel.name)
+            except discord.HTTPException as e:
+                log.warning("publish failed channel=%s status=%s error=%r", channel.name, e.status, str(e))
+            except Exception:
+                log.exception("publish failed channel=%s", channel.name)
+            finally:
+                queue.task_done()
+
+    def close(self):
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
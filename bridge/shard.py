@@ -0,0 +1,204 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def shard_of(channel_name: str, shard_count: int) -> int:
+    """The shard that owns a channel; stable across restarts and processes"""
+    return zlib.crc32(channel_name.lower().encode("utf-8")) % shard_count
+
+
+class ShardChannel:
+    """Stands in for a Discord channel inside a worker; sends go to the coordinator"""
+
+    def __init__(self, link: "ShardLink", channel_id: int, name: str):
+        self.link = link
+        self.id = channel_id
+        self.name = name
+
+    async def send(self, embed=None, embeds=None, newer=None, **kwargs):
+        return await self.link.hand_off(self.id, embeds or [embed], newer)
+
+
+class HandedOff:
+    """What a worker gets back for a sent post, in place of a discord.Message"""
+
+    def __init__(self, message_id: int):
+        self.id = message_id
+
+
+class ShardLink:
+    """A worker's connection to the coordinating process.
+
+    It takes the bot's place in the worker's TelegramRSSBridge: channels it
+    hands out forward embeds over ``outbox`` and wait for the coordinator's
+    acknowledgement on ``inbox``. Posted links and feed state are forwarded
+    as well, since the coordinator is the only process writing them to disk.
+    """
+
+    def __init__(self, index: int, count: int, outbox, inbox, channel_names: Dict[int, str]):
+        self.index = index
+        self.count = count
+        self.outbox = outbox
+        self.inbox = inbox
+        self.channel_names = channel_names
+        self.loop = asyncio.get_running_loop()
+        self.closed = asyncio.Event()
+        self._waiting: Dict[Tuple[int, int], asyncio.Future] = {}
+        # A restarted worker reuses its predecessor's inbox, so request ids carry
+        # the pid; late acks for the dead process then match nothing here
+        self._pid = os.getpid()
+        self._request_ids = itertools.count()
+
+    def get_channel(self, channel_id: int) -> Optional[ShardChannel]:
+        name = self.channel_names.get(channel_id)
+        return ShardChannel(self, channel_id, name) if name else None
+
+    async def wait_until_ready(self):
+        pass
+
+    async def hand_off(self, channel_id: int, embeds, newer: Optional[int] = None) -> HandedOff:
+        """Have the coordinator send ``embeds``; ``newer`` is passed on to ``deliver_shard_post``"""
+        request_id = (self._pid, next(self._request_ids))
+        future = self._waiting[request_id] = self.loop.create_future()
+        self.outbox.put(("post", self.index, request_id, channel_id, [embed.to_dict() for embed in embeds], newer))
+        try:
+            message_id, error = await future
+        finally:
+            self._waiting.pop(request_id, None)
+        if error:
+            raise RuntimeError(error)
+        return HandedOff(message_id)
+
+    def posted(self, channel_name: str, link: str, posted_at: float):
+        self.outbox.put(("posted", self.index, channel_name, link, posted_at))
+
+    def feed_state(self, channel_name: str, state: dict):
+        self.outbox.put(("feed_state", self.index, channel_name, state))
+
+    async def listen(self):
+        """Resolve hand-offs as acknowledgements arrive, until told to stop"""
+        while True:
+            message = await asyncio.to_thread(self.inbox.get)
+            if message is None:
+                break
+            _, request_id, message_id, error = message
+            future = self._waiting.get(request_id)
+            if future and not future.done():
+                future.set_result((message_id, error))
+        self.closed.set()
+
+
+async def _run_worker(index: int, count: int, keys: dict, outbox, inbox, channel_names: Dict[int, str]):
+    from cogs.telegram import TelegramRSSBridge
+
+    link = ShardLink(index, count, outbox, inbox, channel_names)
+    listener = asyncio.create_task(link.listen())
+    cog = TelegramRSSBridge(link, keys=keys, shard=link)
+    try:
+        await link.closed.wait()
+    finally:
+        cog.cog_unload()
+        listener.cancel()
+        # Give the HTTP session close that cog_unload scheduled a chance to run
+        await asyncio.sleep(0.25)
+
+
+def run_worker(index: int, count: int, keys: dict, outbox, inbox, channel_names: Dict[int, str]):
+    """Entry point of a worker process"""
+    # force, since re-importing main.py has already configured logging without the shard
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s %(levelname)s shard={index} %(name)s %(message)s",
+                        force=True)
+    try:
+        asyncio.run(_run_worker(index, count, keys, outbox, inbox, channel_names))
+    except KeyboardInterrupt:
+        pass
+
+
+class ShardPool:
+    """Runs the worker processes and relays their messages to the coordinating cog.
+
+    ``cog`` supplies the coroutine ``deliver_shard_post(channel_id, embed_dicts,
+    newer)``, which returns the sent message, plus ``record_posted`` and
+    ``commit_feed_state``. Workers are started with the spawn method so none
+    of them inherits the coordinator's event loop or Discord connection.
+    """
+
+    def __init__(self, cog, count: int, keys: dict, channel_names: Dict[int, str]):
+        self.cog = cog
+        self.count = count
+        self.keys = keys
+        self.channel_names = channel_names
+        self.context = multiprocessing.get_context("spawn")
+        self.outbox = self.context.Queue()
+        self.inboxes = [self.context.Queue() for _ in range(count)]
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * count
+        self.relay: Optional[asyncio.Task] = None
+
+    def start(self):
+        for index in range(self.count):
+            self._spawn(index)
+        self.relay = asyncio.create_task(self._relay())
+
+    def _spawn(self, index: int):
+        process = self.context.Process(
+            target=run_worker,
+            args=(index, self.count, self.keys, self.outbox, self.inboxes[index], self.channel_names),
+            name=f"bridge-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[index] = process
+        log.info("shard started index=%s pid=%s", index, process.pid)
+
+    def check(self):
+        """Restart workers that have died; they reload their state from disk"""
+        for index, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                log.warning("shard exited index=%s exitcode=%s, restarting", index, process.exitcode)
+                self._spawn(index)
+
+    async def _relay(self):
+        while True:
+            message = await asyncio.to_thread(self.outbox.get)
+            if message is None:
+                break
+            kind, index = message[0], message[1]
+            try:
+                if kind == "post":
+                    _, _, request_id, channel_id, embed_dicts, newer = message
+                    send = self.cog.deliver_shard_post(channel_id, embed_dicts, newer)
+                    asyncio.create_task(self._acknowledge(index, request_id, send))
+                elif kind == "posted":
+                    _, _, channel_name, link, posted_at = message
+                    self.cog.record_posted(channel_name, link, posted_at)
+                elif kind == "feed_state":
+                    _, _, channel_name, state = message
+                    self.cog.commit_feed_state(channel_name, state)
+            except Exception:
+                log.exception("shard message failed kind=%s shard=%s", kind, index)
+
+    async def _acknowledge(self, index: int, request_id: Tuple[int, int], send):
+        try:
+            message = await send
+            reply = ("ack", request_id, message.id, None)
+        except Exception as e:
+            reply = ("ack", request_id, None, str(e) or type(e).__name__)
+        self.inboxes[index].put(reply)
+
+    def stop(self, timeout: float = 5):
+        for inbox in self.inboxes:
+            inbox.put(None)
+        self.outbox.put(None)
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
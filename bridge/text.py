@@ -0,0 +1,340 @@
+import re
+import html
+import itertools
+from typing import Dict, List, NamedTuple, Optional
+
+# Everything here is compiled once at import time; the old clean_text rebuilt
+# the emoji class and several patterns for every post.
+
+# Emoji spacing used to match this list of blocks:
+#   U+1F1E0-1F1FF flags, U+1F300-1F5FF symbols & pictographs,
+#   U+1F600-1F64F emoticons, U+1F680-1F6FF transport & map,
+#   U+1F700-1F8FF alchemical/geometric/arrows, U+1F900-1FAFF supplemental
+#   pictographs and chess, U+2702-27B0 dingbats, and U+24C2-1F251.
+# The last block swallows every other one except the pictograph tail, so the
+# whole class is one contiguous span, which is far cheaper to test per character.
+_EMOJI = '\U000024C2-\U0001FAFF'
+
+FORWARD_RE = re.compile(r'Forwarded From(?: <b><a href="([^"]+)">([^<]+)</a></b> \(([^)]+)\)|.*?\))', re.S)
+IMG_RE = re.compile(r'<img[^>]+src="([^"]+)"[^>]*>')
+_HREF_RE = re.compile(r'\bhref="([^"]*)"')
+_SRC_RE = re.compile(r'\bsrc="([^"]*)"')
+
+# Everything the converter has to act on. Each token is matched from its
+# first character, which comes from a single leading character class; the
+# regex engine can then skip plain text in C, testing one class per
+# character instead of trying every alternative. Lookbehinds on that first
+# character pick the alternative, and the named groups tell them apart.
+# Single spaces aren't tokens at all, runs of them are collapsed afterwards.
+_TOKEN_RE = re.compile(
+    rf'[<&\t\n\r\f\v—*~`|\\_\d{_EMOJI}]'
+    r'(?:(?<=<)(?P<close>/?)(?P<tag>[a-zA-Z][a-zA-Z0-9-]*)(?P<attrs>[^>]*)>'
+    r'|(?<=&)(?P<entity>#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);'
+    r'|(?<=\d)(?P<time>\d:\d\d [AP]M)'
+    r'|(?<=—)(?P<dash>)'
+    rf'|(?<=[{_EMOJI}])(?P<emoji>[{_EMOJI}]*)'
+    # Characters Discord would read as markdown; intraword underscores are
+    # left alone so URLs and snake_case survive
+    r'|(?<=[*~`|\\])(?P<md>)'
+    r'|(?<=_)(?:(?<!\w_)|(?!\w))(?P<underscore>)'
+    r'|(?<=[^\S ])(?P<ws>\s*))'
+)
+# Posts written with spaces between every letter drop all whitespace, so
+# there single spaces have to be tokens too
+_SQUASHED_TOKEN_RE = re.compile(_TOKEN_RE.pattern.replace(r'\t\n\r\f\v', r'\s').replace(r'(?<=[^\S ])', r'(?<=\s)'))
+
+# Runs of single letters separated by spaces, e.g. "H e l l o". The match
+# starts at the first space so the engine can jump between spaces.
+_LETTERS_RE = re.compile(r' (?<=(?<!\S)[^\W\d_] )[^\W\d_](?: [^\W\d_])*(?!\S)')
+_MULTI_SPACE_RE = re.compile(r'  +')
+_BLANK_LINES_RE = re.compile(r'\n\n\n+')
+
+# Inline tags and the Discord markdown they turn into
+_INLINE_MARKDOWN = {
+    'b': '**', 'strong': '**',
+    'i': '*', 'em': '*',
+    'u': '__',
+    's': '~~', 'strike': '~~', 'del': '~~',
+    'code': '`',
+    'spoiler': '||', 'tg-spoiler': '||',
+}
+_BLOCK_TAGS = {'p', 'div', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+DESCRIPTION_LIMIT = 4096
+# Stands for a <pre> block among the open markers; it's closed by a fence
+_PRE = 'pre'
+
+
+class Description(NamedTuple):
+    """A feed description converted for a Discord embed"""
+    text: str
+    images: List[str]
+    forward_author: Optional[str] = None
+    forward_channel: Optional[str] = None
+    forward_link: Optional[str] = None
+    truncated: bool = False
+
+
+def is_spaced_text(text: str) -> bool:
+    """Whether a post is written with spaces between its letters"""
+    spaces = text.count(" ")
+    chars = len(text) - spaces
+    return spaces > chars * 0.5  # If more than 50% of non-space chars have spaces between them
+
+
+def _join_letters(match):
+    return match.group().replace(' ', '')
+
+
+class _Converter:
+    """Streaming HTML to Discord markdown conversion of one description.
+
+    Output is gathered as a list of pieces. Its length is only totalled at
+    checkpoints, so conversion stops as soon as the description limit is out
+    of reach instead of rendering the whole post and slicing it afterwards.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.out: List[str] = []
+        self.images: List[str] = []
+        self.open_tags: List[str] = []  # markdown markers still waiting for their closing tag
+        self.links: List[tuple] = []  # (href, index of the placeholder in out)
+        # Index in out of every formatting marker and code fence, with what it opens or closes
+        self.markup: Dict[int, str] = {}
+        # Index in out of each masked link's "[" -> index of its "](href)"
+        self.masked: Dict[int, int] = {}
+        self.line_break = '\n'
+        self.pre = False
+        # Discord shows backslashes literally in code, so nothing is escaped there
+        self.code = False
+
+    def tag(self, name: str, closing: bool, attrs: str):
+        out = self.out
+        name = name.lower()
+        marker = _INLINE_MARKDOWN.get(name)
+        if marker:
+            if self.pre:
+                return
+            if name == 'code':
+                self.code = not closing
+            if closing:
+                if marker in self.open_tags:
+                    self.open_tags.remove(marker)
+                    if out and self.markup.get(len(out) - 1) == marker:
+                        # Nothing inside, so drop the pair rather than leave stray markers
+                        out.pop()
+                        del self.markup[len(out)]
+                    else:
+                        self.markup[len(out)] = marker
+                        out.append(marker)
+            else:
+                self.open_tags.append(marker)
+                self.markup[len(out)] = marker
+                out.append(marker)
+        elif name == 'a':
+            if closing:
+                self.close_link()
+            else:
+                href = _HREF_RE.search(attrs)
+                self.links.append((html.unescape(href.group(1)) if href else '', len(out)))
+                out.append('')
+        elif name == 'img':
+            src = _SRC_RE.search(attrs)
+            if src and not closing:
+                self.images.append(html.unescape(src.group(1)))
+        elif name == 'blockquote':
+            self.line_break = '\n' if closing else '\n> '
+            out.append(self.line_break)
+        elif name == 'pre':
+            self.pre = not closing
+            self.markup[len(out)] = _PRE
+            out.append('\n```\n')
+        elif name in _BLOCK_TAGS and closing:
+            out.append(self.line_break)
+
+    def close_link(self):
+        if not self.links:
+            return
+        href, start = self.links.pop()
+        out = self.out
+        label = ''.join(out[start:]).strip()
+        if not label or '?q=%23' in href:
+            # Hashtag search links read best as the bare hashtag
+            return
+        if label == href or label.replace('\\', '') == href:
+            del out[start:]
+            for index in [index for index in self.markup if index >= start]:
+                del self.markup[index]
+            out.append(href)
+        elif href.startswith(('http://', 'https://')):
+            out[start] = '['
+            self.masked[start] = len(out)
+            out.append(f']({href})')
+
+    def _cut(self, room: int):
+        """The pieces of out that fit in ``room`` characters, and the markers left open in them.
+
+        Only plain text is ever split, and then preferably at a space. Links
+        whose "](href)" doesn't fit lose their "[", and markers opened right
+        at the end are dropped rather than closed around nothing.
+        """
+        out = self.out
+        ends = []
+        total = 0
+        for piece in out:
+            total += len(piece)
+            ends.append(total)
+
+        link_ends = set(self.masked.values())
+        kept = []  # (index, piece)
+        open_markers = []
+        used = 0
+        for index, piece in enumerate(out):
+            marker = self.markup.get(index)
+            if used + len(piece) > room:
+                if marker is None and index not in self.masked and index not in link_ends:
+                    part = piece[:room - used]
+                    space = part.rfind(' ', len(part) - 80)
+                    if space > 0:
+                        part = part[:space]
+                    # Don't leave an escape hanging off the end
+                    kept.append((index, part.rstrip('\\')))
+                break
+            if marker is not None:
+                if marker in open_markers:
+                    del open_markers[len(open_markers) - 1 - open_markers[::-1].index(marker)]
+                else:
+                    open_markers.append(marker)
+            elif index in self.masked and ends[self.masked[index]] > room:
+                piece = ''
+            kept.append((index, piece))
+            used += len(piece)
+
+        while kept and open_markers and self.markup.get(kept[-1][0]) == open_markers[-1]:
+            kept.pop()
+            open_markers.pop()
+        return [piece for _, piece in kept], open_markers
+
+    def finish(self, truncated: bool) -> str:
+        # Close whatever formatting is still open
+        closers = list(reversed(self.open_tags))
+        if self.pre:
+            closers.append('\n```')
+        text = self._render(self.out + closers)
+        if not truncated and len(text) <= self.limit:
+            return text
+
+        # Cut the body first, so the closing markers are never the part cut off.
+        # Rendering shrinks the pieces a little, so the cut is widened (or
+        # narrowed) by what's left over until the result is close to the limit.
+        room = self.limit - 1
+        best = None
+        for attempt in itertools.count():
+            pieces, open_markers = self._cut(room)
+            closers = ''.join('\n```' if marker == _PRE else marker for marker in reversed(open_markers))
+            text = self._render(pieces) + '…' + closers
+            spare = self.limit - len(text)
+            if spare >= 0 and (best is None or len(text) > len(best)):
+                best = text
+            if best is not None and (spare < 16 or attempt >= 5):
+                return best
+            room += spare if spare else -1
+
+    @staticmethod
+    def _render(pieces: List[str]) -> str:
+        text = ''.join(pieces)
+        if '  ' in text:
+            # Rewrites can leave doubled spaces where they meet existing ones
+            text = _MULTI_SPACE_RE.sub(' ', text)
+        text = _LETTERS_RE.sub(_join_letters, text)
+        if '\n' in text:
+            text = '\n'.join([line.strip(' ') for line in text.split('\n')])
+            if '\n\n\n' in text:
+                text = _BLANK_LINES_RE.sub('\n\n', text)
+        return text.strip()
+
+
+def convert_description(content: str, limit: int = DESCRIPTION_LIMIT) -> Description:
+    """Convert an RSS description into an embed description in one pass.
+
+    Formatting tags become Discord markdown, links become masked links,
+    hashtag links become plain hashtags, images are collected, entities are
+    decoded, emojis are spaced out, and dashes and event times start new
+    lines. Posts written with spaces between every letter are squashed, and
+    runs of single letters ("H e l l o") are joined back into words. The
+    result is cut to ``limit`` characters.
+    """
+    forward = FORWARD_RE.search(content)
+    if forward:
+        body_start, body_end = forward.span()
+        content = content[:body_start] + content[body_end:]
+
+    squash = is_spaced_text(content)
+    token_re = _SQUASHED_TOKEN_RE if squash else _TOKEN_RE
+    converter = _Converter(limit)
+    out = converter.out
+    append = out.append
+    # Markup mostly shrinks the text, so the output length is only totalled once
+    # the input position gets near the budget.
+    # The slack leaves room for the post-passes to shrink it back under the limit.
+    budget = limit * 2
+    checkpoint = budget
+    truncated = False
+    position = 0
+
+    for match in token_re.finditer(content):
+        start = match.start()
+        if start > checkpoint:
+            length = sum(map(len, out))
+            if length > budget:
+                truncated = True
+                # Images past the cut still count towards the post's gallery
+                converter.images.extend(html.unescape(src) for src in IMG_RE.findall(content, start))
+                break
+            checkpoint = start + budget - length
+        if start > position:
+            append(content[position:start])
+        position = match.end()
+
+        kind = match.lastgroup
+        if kind == 'attrs':
+            # Tags end on their attribute group
+            name = match.group('tag')
+            if name == 'br':
+                append(converter.line_break)
+            else:
+                converter.tag(name, bool(match.group('close')), match.group('attrs'))
+        elif kind == 'ws':
+            if not squash:
+                append('\n' if converter.pre and '\n' in match.group() else ' ')
+        elif kind == 'md' or kind == 'underscore':
+            append(match.group() if converter.pre or converter.code else '\\' + match.group())
+        elif kind == 'emoji':
+            # Give every emoji room on both sides
+            append(' ' + ' '.join(match.group()) + ' ')
+        elif kind == 'entity':
+            append(html.unescape(match.group()))
+        elif kind == 'time':
+            append(converter.line_break + match.group())
+        else:
+            line_break = converter.line_break
+            append(line_break + '—' + line_break)
+    else:
+        if position < len(content):
+            append(content[position:])
+
+    if truncated:
+        # Links cut off before their closing tag are left as plain text
+        converter.links.clear()
+    while converter.links:
+        converter.close_link()
+
+    return Description(
+        text=converter.finish(truncated),
+        images=converter.images,
+        forward_author=forward.group(3) if forward else None,
+        forward_channel=forward.group(2) if forward else None,
+        forward_link=forward.group(1) if forward else None,
+        truncated=truncated,
+    )
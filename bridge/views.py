@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import discord
+
+from bridge.pending import PendingStore
+
+
+class PendingListView(discord.ui.View):
+    """Paged listing of the pending-post queue.
+
+    Each page covers at most ``page_size`` posts of one channel and is read
+    from the store only when it's shown, so listing a queue of any size
+    costs one query per page and a single message.
+    """
+
+    def __init__(self, store: PendingStore, counts: Dict[str, int], author_id: int,
+                 color: int, page_size: int = 10):
+        super().__init__(timeout=300)
+        self.store = store
+        self.author_id = author_id
+        self.color = color
+        self.page_size = page_size
+        # (channel, page within that channel, posts in that channel)
+        self.pages: List[Tuple[str, int, int]] = [
+            (channel, page, count)
+            for channel, count in counts.items()
+            for page in range(-(-count // page_size))
+        ]
+        self.index = 0
+        self.message = None
+
+    async def render(self) -> discord.Embed:
+        channel, page, count = self.pages[self.index]
+        offset = page * self.page_size
+        posts = await asyncio.to_thread(self.store.page, channel, offset, self.page_size)
+
+        embed = discord.Embed(title=f"Pending Posts for {channel}", color=self.color)
+        for i, post in enumerate(posts, start=offset + 1):
+            post_date = datetime.fromisoformat(post["post_date"]).strftime("%Y-%m-%d %H:%M UTC")
+            embed.add_field(
+                name=f"Post #{i}",
+                value=f"Posted at: {post_date}\nLink: {post['link']}",
+                inline=False
+            )
+        if not posts:
+            embed.description = "These posts have been published or cleared since the listing was opened."
+        embed.set_footer(text=f"Page {self.index + 1}/{len(self.pages)} · {count} pending in {channel}")
+
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user is not None and interaction.user.id == self.author_id
+
+    async def show(self, interaction: discord.Interaction):
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, button: discord.ui.Button, interaction: discord.Interaction):
+        self.index = max(self.index - 1, 0)
+        await self.show(interaction)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, button: discord.ui.Button, interaction: discord.Interaction):
+        self.index = min(self.index + 1, len(self.pages) - 1)
+        await self.show(interaction)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
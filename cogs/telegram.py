@@ -1,69 +1,297 @@
 import discord
 from discord.ext import commands, tasks
-import cloudscraper
-import feedparser
 import json
 from pathlib import Path
 from datetime import datetime, timezone
 import re
 import asyncio
-from telethon import TelegramClient
-import os
+import calendar
+import threading
+import time
 from typing import Dict, List, Optional
 import aiohttp
+import hashlib
+from collections import Counter
+import logging
+
+from bridge.dedup import LinkJournal, PostedLinks
+from bridge.feed import FeedFormatError, scan_feed
+from bridge.mappings import Destination, parse_mappings
+from bridge.media_cache import MediaCache
+from bridge.metrics import BridgeMetrics, start_metrics_server
+from bridge.pending import PendingStore
+from bridge.schedule import PollScheduler
+from bridge.sender import SendScheduler
+from bridge.shard import ShardLink, ShardPool, shard_of
+from bridge.text import DESCRIPTION_LIMIT, IMG_RE, convert_description
+from bridge.views import PendingListView
+
+# telethon and cloudscraper are slow to import, so they're only loaded once
+# the bot is connected (see start_bridge); feedparser only for feeds that
+# the streaming scanner can't read
+
+RSS_URL = "https://rss.tabithahanegan.com/telegram/channel/{channel_name}"
+
+log = logging.getLogger(__name__)
+
+# Discord shows up to four embeds that share a URL as one post with an image gallery
+GALLERY_SIZE = 4
+
 
 class TelegramRSSBridge(commands.Cog):
-    def __init__(self, bot, since_date=None):
+    """Bridges Telegram channels, read through their RSS feeds, into Discord channels.
+
+    Construction only sets up configuration so the bot can log in straight
+    away. Saved state, the scraper and the Telegram client are loaded by
+    ``start_bridge`` once the gateway is ready; commands wait for that.
+
+    With ``shards`` set above 1 in keys.json, the cog holding the Discord
+    connection polls nothing itself. It starts that many worker processes,
+    each running its own copy of the cog with a ``ShardLink`` as both
+    ``bot`` and ``shard``, and each owning the channels whose name hashes to
+    its index. Workers send their embeds back to be posted here, and this
+    process stays the only one writing posted links and feed state.
+    """
+
+    def __init__(self, bot, since_date=None, max_concurrent_fetches=None, keys: Optional[dict] = None,
+                 shard: Optional[ShardLink] = None):
         self.bot = bot
+        self.shard = shard
         self.mappings_path = "mappings.json"
         self.posted_links_path = "posted_links.json"
+        self.posted_links_journal_path = "posted_links.journal"
         self.pending_posts_path = "pending_posts.json"
+        self.pending_db_path = "pending_posts.db"
+        self.feed_state_path = "feed_state.json"
+        self.media_cache_path = "media_cache.json"
         self.keys_path = "keys.json"
         
-        # Load keys from keys.json
-        try:
-            with open(self.keys_path, 'r') as f:
-                self.keys = json.load(f)
-        except FileNotFoundError:
-            print("Error: keys.json not found!")
-            self.keys = {}
-        
-        self.channel_mappings = self.load_mappings()
-        self.posted_links = self.load_posted_links()
-        self.pending_posts: Dict[str, List[dict]] = self.load_pending_posts()
+        # main.py has usually loaded keys.json already
+        self.keys = keys if keys is not None else self.load_keys()
+        self.shard_count = self.keys.get("shards", 1)
+        self.shards: Optional[ShardPool] = None
+        if shard is not None:
+            # Workers only poll their own channels, so their media caches don't overlap
+            self.media_cache_path = f"media_cache.shard{shard.index}.json"
+
+        # Everything below is filled in by start_bridge
+        self.ready = asyncio.Event()
+        # Set once the first start_bridge has finished, whether or not it worked
+        self.startup_done = asyncio.Event()
+        self.startup_error: Optional[Exception] = None
+        # Telegram channel -> the Discord channels (or threads) its posts go to
+        self.channel_mappings: Dict[str, List[Destination]] = {}
+        self.posted_links_journal: Optional[LinkJournal] = None
+        self.journal_compact_threshold = self.keys.get("posted_links_compact_every", 500)
+        self.posted_links: Optional[PostedLinks] = None
+        self.pending_posts: Optional[PendingStore] = None
+        # Per-channel ETag/Last-Modified validators and body hash of the last processed feed
+        self.feed_state: Dict[str, dict] = {}
+        # Feed state changed since it was last written; it's saved once per tick
+        self.feed_state_dirty = False
+        self.media_cache: Optional[MediaCache] = None
+        # cloudscraper sessions carry cookie and challenge state and aren't
+        # thread-safe, so every fetch thread gets its own (see get_scraper)
+        self.create_scraper = None
+        self.scrapers = threading.local()
+        self.tg_client = None
+        # Marked Telegram chat id -> channel name, for channels whose posts are pushed to us
+        self.push_channels: Dict[int, str] = {}
+        # Marked Telegram chat id -> the channel's username as Telegram spells it
+        self.push_usernames: Dict[int, str] = {}
+        # (destination dedup key, link) of posts being sent right now, by either polling or push
+        self.in_flight = set()
+        # Channel name -> its poll, which runs until every post it queued is sent
+        self.poll_tasks: Dict[str, asyncio.Task] = {}
+
         self.since_date = since_date  # datetime object or None
-        self.scraper = cloudscraper.create_scraper()
+        # Limit how many feeds are fetched at once so a big mapping list
+        # doesn't open dozens of connections to the RSS bridge in one burst
+        self.max_concurrent_fetches = max_concurrent_fetches or self.keys.get("rss_max_concurrency", 8)
+        self.fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        self.poll_scheduler = PollScheduler(
+            min_interval=self.keys.get("poll_min_seconds", 60),
+            max_interval=self.keys.get("poll_max_seconds", 1800),
+            requests_per_minute=self.keys.get("rss_requests_per_minute", 30),
+            reconcile_interval=self.keys.get("push_reconcile_seconds", 3600),
+        )
         self.color = 0x0088cc  # Telegram's brand color
+        self.metrics = BridgeMetrics()
+        self.metrics.registry.add_collector(self.collect_metrics)
+        # Served on localhost only; set metrics_port to null to turn the endpoint off
+        self.metrics_port = self.keys.get("metrics_port", 9108)
+        if self.metrics_port and shard is not None:
+            self.metrics_port += 1 + shard.index
+        self.metrics_runner = None
+        # Extra images of a post as a gallery rather than a "+N more images" note
+        self.embed_gallery = self.keys.get("embed_gallery", False)
+        self.sender = SendScheduler(
+            crosspost_limit=self.keys.get("crosspost_limit_per_hour", 10),
+            batch=self.keys.get("batch_sends", False),
+            send_latency=self.metrics.send,
+            publish_latency=self.metrics.publish,
+        )
         self.check_rss.start()
         
-        # Initialize Telegram client
-        self.tg_client = None
+        # Telegram client settings; the client itself is created by start_bridge
         self.telegram_api_id = self.keys.get("telegram_api_id")
         self.telegram_api_hash = self.keys.get("telegram_api_hash")
         self.telegram_bot_token = self.keys.get("telegram_bot_token")
         self.telegram_phone = None
-        
-        self.tg_client = TelegramClient('telegram_session', 
+        self.tg_authorized = False
+        self.tg_auth_lock = asyncio.Lock()
+        # Resolved channel entities, keyed by lowercase username -> (entity, resolved_at)
+        self.tg_entities: Dict[str, tuple] = {}
+        self.tg_entity_ttl = self.keys.get("telegram_entity_ttl_hours", 24) * 3600
+        # Set while Telegram has us in a FloodWait, so lookups back off instead of piling on
+        self.tg_flood_until = 0.0
+
+        # imgbb rejects uploads over 32 MB
+        self.media_max_bytes = self.keys.get("media_max_bytes", 32 * 1024 * 1024)
+        # Bounds concurrent media downloads/uploads across all channels
+        self.media_semaphore = asyncio.Semaphore(self.keys.get("media_concurrency", 4))
+
+        # Shared HTTP session for the Telegram Bot API and image host, created on first use
+        self.http_session: Optional[aiohttp.ClientSession] = None
+
+    def load_keys(self) -> dict:
+        try:
+            with open(self.keys_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            log.error("keys.json not found path=%s", self.keys_path)
+            return {}
+
+    async def start_bridge(self):
+        """Load saved state and create the clients, off the event loop where possible.
+
+        Runs once, after the bot has connected; later calls (e.g. after a
+        gateway reconnect) return straight away.
+        """
+        if self.ready.is_set():
+            return
+        started = time.perf_counter()
+        await asyncio.to_thread(self.load_state)
+        self.poll_scheduler.set_channels(self.owned_channels())
+
+        # Imported by load_state's thread already, so this only binds the name
+        from telethon import TelegramClient
+        # Telethon sessions can't be shared between processes
+        session = 'telegram_session' if self.shard is None else f'telegram_session_shard{self.shard.index}'
+        self.tg_client = TelegramClient(session, 
                                       self.telegram_api_id,
                                       self.telegram_api_hash)
+        if self.shard is None and self.shard_count > 1:
+            channel_names = {
+                destination.target_id: name
+                for name, destinations in self.channel_mappings.items()
+                for destination in destinations
+            }
+            self.shards = ShardPool(self, self.shard_count, self.keys, channel_names)
+            self.shards.start()
+        self.ready.set()
+        log.info("bridge started channels=%d seconds=%.3f", len(self.poll_scheduler.channels), time.perf_counter() - started)
+
+    def owned_channels(self) -> List[str]:
+        """The mapped channels this process polls"""
+        if self.shard is not None:
+            return [name for name in self.channel_mappings if shard_of(name, self.shard.count) == self.shard.index]
+        if self.shard_count > 1:
+            # The workers poll everything
+            return []
+        return list(self.channel_mappings)
+
+    def load_state(self):
+        """Read the on-disk state and import the heavy client libraries; runs in a worker thread"""
+        import cloudscraper
+        import telethon  # noqa: F401
+
+        self.channel_mappings = self.load_mappings()
+        self.posted_links_journal = LinkJournal(self.posted_links_journal_path)
+        self.posted_links = self.load_posted_links()
+        self.pending_posts = self.load_pending_posts()
+        self.feed_state = self.load_feed_state()
+        # Hosted URLs of media we've already uploaded
+        media_cache = MediaCache(
+            self.media_cache_path,
+            ttl_days=self.keys.get("media_cache_ttl_days", 30),
+            max_entries=self.keys.get("media_cache_max_entries", 5000),
+        )
+        media_cache.load()
+        self.media_cache = media_cache
+        self.create_scraper = cloudscraper.create_scraper
+
+    async def cog_before_invoke(self, ctx):
+        # Commands issued right after login wait for the saved state to be loaded
+        await self.startup_done.wait()
+        if self.startup_error is not None:
+            raise commands.CommandError(f"The Telegram bridge failed to start: {self.startup_error!r}")
+
+    async def get_http_session(self) -> aiohttp.ClientSession:
+        """Return the cog's pooled HTTP session, creating it if needed"""
+        if self.http_session is None or self.http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.keys.get("http_max_connections", 32),
+                limit_per_host=self.keys.get("http_max_connections_per_host", 8),
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            timeout = aiohttp.ClientTimeout(total=60, connect=10, sock_read=30)
+            self.http_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.http_session
 
     async def start_telegram_client(self):
-        """Start the Telegram client with appropriate authentication"""
-        if not self.tg_client.is_connected():
-            await self.tg_client.connect()
-            
-        if not await self.tg_client.is_user_authorized():
-            if self.telegram_bot_token:
-                # Use bot token
-                await self.tg_client.start(bot_token=self.telegram_bot_token)
-            elif self.telegram_phone:
-                # Use phone number authentication
-                await self.tg_client.start(phone=self.telegram_phone)
-            else:
-                print("Error: No authentication method provided. Please set either telegram_bot_token or telegram_phone")
-                return False
+        """Start the Telegram client with appropriate authentication.
+
+        Authorization is checked once and remembered; later calls only make
+        sure the connection is still up.
+        """
+        if self.tg_authorized and self.tg_client.is_connected():
+            return True
+
+        async with self.tg_auth_lock:
+            if not self.tg_client.is_connected():
+                await self.tg_client.connect()
+            if self.tg_authorized:
+                return True
+
+            if not await self.tg_client.is_user_authorized():
+                if self.telegram_bot_token:
+                    # Use bot token
+                    await self.tg_client.start(bot_token=self.telegram_bot_token)
+                elif self.telegram_phone:
+                    # Use phone number authentication
+                    await self.tg_client.start(phone=self.telegram_phone)
+                else:
+                    log.error("no telegram authentication configured, set telegram_bot_token or telegram_phone")
+                    return False
+            self.tg_authorized = True
         return True
 
+    async def get_channel_entity(self, channel_name: str):
+        """Resolve a channel username, reusing earlier lookups until they go stale"""
+        from telethon.errors import FloodWaitError
+        key = channel_name.lower()
+        cached = self.tg_entities.get(key)
+        if cached and time.monotonic() - cached[1] < self.tg_entity_ttl:
+            return cached[0]
+
+        if time.monotonic() < self.tg_flood_until:
+            # Fall back to a stale entity rather than waiting out the flood
+            return cached[0] if cached else None
+
+        try:
+            entity = await self.tg_client.get_entity(channel_name)
+        except FloodWaitError as e:
+            log.warning("telegram flood wait channel=%s seconds=%s", channel_name, e.seconds)
+            self.tg_flood_until = time.monotonic() + e.seconds
+            return cached[0] if cached else None
+        self.tg_entities[key] = (entity, time.monotonic())
+        return entity
+
+    def forget_channel_entity(self, channel_name: str):
+        self.tg_entities.pop(channel_name.lower(), None)
+
     def load_mappings(self):
         path = Path(self.mappings_path)
         if not path.exists():
@@ -71,186 +299,378 @@ class TelegramRSSBridge(commands.Cog):
                 json.dump({}, f, indent=4)
             return {}
         with path.open("r") as f:
-            return json.load(f)
+            return parse_mappings(json.load(f))
 
-    def load_posted_links(self):
+    def load_posted_links(self) -> PostedLinks:
+        options = {
+            "max_per_channel": self.keys.get("posted_links_max_per_channel", 1000),
+            "max_age_days": self.keys.get("posted_links_max_age_days", 90),
+        }
+        # The journal is read before the snapshot. Another process compacting
+        # in between then at worst leaves links in both, where reading the
+        # snapshot first could pair the old snapshot with an emptied journal.
+        journaled = self.posted_links_journal.read()
         path = Path(self.posted_links_path)
-        if not path.exists():
-            return {channel: [] for channel in self.channel_mappings}
-        try:
-            with path.open("r") as f:
-                return json.load(f)
-        except:
-            return {channel: [] for channel in self.channel_mappings}
+        store = PostedLinks(**options)
+        data = {}
+        if path.exists():
+            try:
+                with path.open("r") as f:
+                    data = json.load(f)
+                store = PostedLinks.from_dict(data, **options)
+            except:
+                pass
 
-    def load_pending_posts(self) -> Dict[str, List[dict]]:
-        path = Path(self.pending_posts_path)
+        # Links recorded since the last snapshot live in the journal
+        self.posted_links_journal.replay(store, journaled)
+        # Links used to be remembered per Telegram channel rather than per
+        # destination; each destination starts off with that history
+        keys = []
+        for source, destinations in self.channel_mappings.items():
+            for destination in destinations:
+                key = destination.dedup_key(source)
+                store.inherit(key, source)
+                keys.append(key)
+        migrated = [source for source in self.channel_mappings if store.forget(source)]
+        store.ensure_channels(keys)
+        if self.shard is None and (
+            self.posted_links_journal.pending or migrated or any(isinstance(links, list) for links in data.values())
+        ):
+            # Fold the journal (or an older layout) into a fresh snapshot straight away
+            self.posted_links = store
+            self.save_posted_links()
+        return store
+
+    def load_pending_posts(self) -> PendingStore:
+        store = PendingStore(self.pending_db_path)
+        if self.shard is not None:
+            return store
+        # Carry over posts queued before the move to SQLite
+        imported = store.import_json(self.pending_posts_path)
+        if imported:
+            log.info("imported pending posts count=%s path=%s", imported, self.pending_posts_path)
+        return store
+
+    def load_feed_state(self) -> Dict[str, dict]:
+        path = Path(self.feed_state_path)
         if not path.exists():
-            return {channel: [] for channel in self.channel_mappings}
+            return {}
         try:
             with path.open("r") as f:
                 return json.load(f)
         except:
-            return {channel: [] for channel in self.channel_mappings}
+            return {}
 
     def save_posted_links(self):
-        with open(self.posted_links_path, "w") as f:
-            json.dump(self.posted_links, f)
+        """Snapshot posted links and truncate the journal"""
+        self.posted_links_journal.compact(self.posted_links, self.posted_links_path)
 
-    def save_pending_posts(self):
-        with open(self.pending_posts_path, "w") as f:
-            json.dump(self.pending_posts, f, indent=4)
+    def record_posted(self, key: str, link: str, posted_at: Optional[float] = None):
+        """Remember a link sent to the destination with dedup ``key``, costing a single journal append"""
+        posted_at = posted_at or time.time()
+        self.posted_links.add(key, link, posted_at)
+        if self.shard is not None:
+            # The coordinating process owns the journal
+            self.shard.posted(key, link, posted_at)
+        else:
+            self.posted_links_journal.append(key, link, posted_at)
+
+    def save_feed_state(self):
+        with open(self.feed_state_path, "w") as f:
+            json.dump(self.feed_state, f)
+        self.feed_state_dirty = False
 
     def cog_unload(self):
+        self.check_rss.cancel()
+        for task in self.poll_tasks.values():
+            task.cancel()
+        self.sender.close()
+        if self.shards:
+            self.shards.stop()
         if self.tg_client and self.tg_client.is_connected():
             self.tg_client.disconnect()
-        self.save_posted_links()
-        self.save_pending_posts()
-        self.check_rss.cancel()
-
-    def clean_text(self, text):
-        # Super simple approach - just join all letters that are separated by single spaces
-        words = text.split()
-        cleaned_words = []
-        current_word = ''
-        
-        for word in words:
-            if len(word) == 1 and word.isalpha():
-                current_word += word
-            else:
-                if current_word:
-                    cleaned_words.append(current_word)
-                    current_word = ''
-                cleaned_words.append(word)
-        
-        if current_word:
-            cleaned_words.append(current_word)
-            
-        text = ' '.join(cleaned_words)
-        
-        # Handle hashtag links
-        text = re.sub(r'<a href="[^"]+\?q=%23([^"]+)">#[^<]+</a>', r'#\1', text)
-        
-        # Handle regular links
-        text = re.sub(r'<a href="([^"]+)"[^>]*>([^<]+)</a>', lambda m: f'<{m.group(1)}>' if m.group(1) == m.group(2) else f'{m.group(2)} <{m.group(1)}>', text)
-        
-        # Remove all other HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Fix special characters
-        text = text.replace('&amp;', '&')
-        
-        # Fix spacing around ALL emojis using correct unicode ranges
-        emoji_pattern = (
-            r'['
-            r'\U0001F1E0-\U0001F1FF'  # flags (iOS)
-            r'\U0001F300-\U0001F5FF'  # symbols & pictographs
-            r'\U0001F600-\U0001F64F'  # emoticons
-            r'\U0001F680-\U0001F6FF'  # transport & map symbols
-            r'\U0001F700-\U0001F77F'  # alchemical symbols
-            r'\U0001F780-\U0001F7FF'  # Geometric Shapes Extended
-            r'\U0001F800-\U0001F8FF'  # Supplemental Arrows-C
-            r'\U0001F900-\U0001F9FF'  # Supplemental Symbols and Pictographs
-            r'\U0001FA00-\U0001FA6F'  # Chess Symbols
-            r'\U0001FA70-\U0001FAFF'  # Symbols and Pictographs Extended-A
-            r'\U00002702-\U000027B0'  # Dingbats
-            r'\U000024C2-\U0001F251' 
-            r']'
-        )
-        text = re.sub(fr'([^\s])({emoji_pattern})', r'\1 \2', text)
-        text = re.sub(fr'({emoji_pattern})([^\s])', r'\1 \2', text)
-        
-        # Fix multiple spaces and newlines
-        text = re.sub(r' +', ' ', text)
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
-        
-        # Fix dashes
-        text = text.replace('—', '\n—\n')
-        
-        # Preserve formatting for event listings
-        text = re.sub(r'(\d{2}:\d{2} [AP]M)', r'\n\1', text)
-        
-        return text.strip()
+        # Unloading before start_bridge finished must not overwrite saved state with empty stores
+        if self.ready.is_set():
+            if self.shard is None:
+                self.save_posted_links()
+                self.save_feed_state()
+            self.pending_posts.close()
+            self.media_cache.save()
+        if self.http_session and not self.http_session.closed:
+            self.bot.loop.create_task(self.http_session.close())
+        if self.metrics_runner:
+            self.bot.loop.create_task(self.metrics_runner.cleanup())
 
-    def is_spaced_text(self, text):
-        # Count the ratio of spaces to characters
-        chars = len(text.replace(" ", ""))
-        spaces = text.count(" ")
-        return spaces > chars * 0.5  # If more than 50% of non-space chars have spaces between them
+    def collect_metrics(self):
+        """Refresh the per-channel gauges right before the metrics are read"""
+        if not self.ready.is_set():
+            return
+        for channel_name, destinations in self.channel_mappings.items():
+            for destination in destinations:
+                key = destination.dedup_key(channel_name)
+                self.metrics.dedup_size.set(self.posted_links.channel_size(key), channel=key)
+                self.metrics.backlog.set(self.sender.backlog(destination.target_id), channel=key)
+        for channel_name, count in self.pending_posts.counts().items():
+            self.metrics.pending.set(count, channel=channel_name)
 
     async def get_file_path(self, file_id: str) -> str:
         """Get the file path from Telegram's API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"https://api.telegram.org/bot{self.telegram_bot_token}/getFile"
-                params = {'file_id': file_id}
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('ok'):
-                            return data['result']['file_path']
+            session = await self.get_http_session()
+            url = f"https://api.telegram.org/bot{self.telegram_bot_token}/getFile"
+            params = {'file_id': file_id}
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('ok'):
+                        return data['result']['file_path']
             return None
         except Exception as e:
-            print(f"Error getting file path: {str(e)}")
+            log.warning("telegram file lookup failed file_id=%s error=%r", file_id, str(e))
             return None
 
-    async def upload_to_imgbb(self, image_path: str) -> str:
-        """Upload an image to imgbb and return the URL"""
+    async def upload_to_imgbb(self, image: bytes, filename: str = "image.jpg") -> str:
+        """Upload an in-memory image to imgbb and return the URL"""
         try:
             api_key = self.keys.get("imgbb_api_key")
             if not api_key:
                 return None
             
-            async with aiohttp.ClientSession() as session:
-                data = aiohttp.FormData()
-                data.add_field('key', api_key)
-                data.add_field('image', open(image_path, 'rb'))
-                
-                async with session.post('https://api.imgbb.com/1/upload', data=data) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('success'):
-                            image_data = data['data']
-                            if image_data.get('image', {}).get('url'):
-                                return image_data['image']['url']
-                            elif image_data.get('display_url'):
-                                return image_data['display_url']
-                            elif image_data.get('url'):
-                                return image_data['url']
+            session = await self.get_http_session()
+            data = aiohttp.FormData()
+            data.add_field('key', api_key)
+            data.add_field('image', image, filename=filename)
+            
+            async with session.post('https://api.imgbb.com/1/upload', data=data) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('success'):
+                        image_data = data['data']
+                        if image_data.get('image', {}).get('url'):
+                            return image_data['image']['url']
+                        elif image_data.get('display_url'):
+                            return image_data['display_url']
+                        elif image_data.get('url'):
+                            return image_data['url']
             return None
         except Exception:
             return None
 
     async def get_media_url(self, channel_name: str, message_id: int) -> str:
         """Get direct media URL from Telegram"""
-        if not self.tg_client:
-            return None
-            
+        channel_name = channel_name.replace('telegram/channel/', '').replace('channel/', '')
+        urls = await self.resolve_media(channel_name, [message_id])
+        return urls.get(message_id)
+
+    async def resolve_media(self, channel_name: str, message_ids: List[int]) -> Dict[int, str]:
+        """Get hosted URLs for several media messages of one channel.
+
+        Cached media is answered straight away. Everything else is fetched with a
+        single batched ``get_messages`` call and then downloaded and uploaded
+        concurrently, bounded by ``media_semaphore``.
+        """
+        urls = {}
+        missing = []
+        for message_id in dict.fromkeys(message_ids):
+            cached = self.media_cache.get_message(channel_name, message_id)
+            if cached:
+                self.metrics.media_cache_hits.inc(kind="message")
+                urls[message_id] = cached
+            else:
+                missing.append(message_id)
+
+        if not missing or not self.tg_client:
+            return urls
+
         try:
             if not await self.start_telegram_client():
+                return urls
+
+            channel = await self.get_channel_entity(channel_name)
+            if channel is None:
+                return urls
+            try:
+                with self.metrics.media_resolve.time():
+                    messages = await self.tg_client.get_messages(channel, ids=missing)
+            except (ValueError, TypeError):
+                # The cached entity no longer resolves (e.g. the channel changed hands)
+                self.forget_channel_entity(channel_name)
+                return urls
+        except Exception as e:
+            log.warning("media lookup failed channel=%s count=%s error=%r", channel_name, len(missing), str(e))
+            return urls
+
+        async def host(message):
+            async with self.media_semaphore:
+                with self.metrics.media_upload.time():
+                    url = await self.host_media(channel_name, message)
+            if url:
+                urls[message.id] = url
+
+        await asyncio.gather(*(host(message) for message in messages if message))
+        return urls
+
+    async def host_media(self, channel_name: str, message) -> Optional[str]:
+        """Download one media message and upload it, reusing earlier uploads of the same bytes"""
+        try:
+            image = await self.download_media_bytes(message)
+            if not image:
                 return None
 
-            channel_name = channel_name.replace('telegram/channel/', '').replace('channel/', '')
-            channel = await self.tg_client.get_entity(channel_name)
-            message = await self.tg_client.get_messages(channel, ids=message_id)
-            
-            if message and message.media:
-                try:
-                    if hasattr(message.media, 'photo') or hasattr(message.media, 'document'):
-                        temp_path = f"temp_{message_id}.jpg"
-                        path = await message.download_media(temp_path)
-                        if path:
-                            url = await self.upload_to_imgbb(path)
-                            os.remove(path)
-                            return url
-                except Exception:
-                    if 'path' in locals() and os.path.exists(path):
-                        os.remove(path)
+            # The same picture is often forwarded between channels, so check by content too
+            digest = hashlib.sha256(image).hexdigest()
+            url = self.media_cache.get_hash(digest)
+            if url:
+                self.metrics.media_cache_hits.inc(kind="hash")
+            else:
+                url = await self.upload_to_imgbb(image, f"{message.id}.jpg")
+            if url:
+                self.media_cache.put(channel_name, message.id, digest, url)
+            return url
+        except Exception:
+            return None
+
+    async def download_media_bytes(self, message) -> Optional[bytes]:
+        """Download a message's photo or document into memory, honouring the size cap"""
+        if not message or not message.media:
+            return None
+        if not (hasattr(message.media, 'photo') or hasattr(message.media, 'document')):
+            return None
+
+        # Check the advertised size first so oversized files are never fetched
+        size = message.file.size if message.file else None
+        if size and size > self.media_max_bytes:
+            log.info("skipping oversized media message=%s bytes=%s cap=%s", message.id, size, self.media_max_bytes)
             return None
+
+        try:
+            image = await message.download_media(file=bytes)
         except Exception:
             return None
+        if image and len(image) > self.media_max_bytes:
+            return None
+        return image
+
+    def parse_media_ref(self, url: str) -> Optional[tuple]:
+        """Pull ``(channel, message_id)`` out of an ``undefined://`` image URL"""
+        if 'undefined://' not in url and 'undefined:' not in url:
+            return None
+
+        parts = url.split('/')
+        msg_id_match = re.search(r'_(\d+)$', parts[-1])
+        if not msg_id_match:
+            return None
+        msg_id = int(msg_id_match.group(1))
+
+        channel = None
+        if 'channel' in parts:
+            channel_index = parts.index('channel')
+            channel_part = '/'.join([p for i, p in enumerate(parts) if i > channel_index])
+            channel_match = re.match(r'([^0-9]+)', channel_part)
+            if channel_match:
+                channel = channel_match.group(1).rstrip('_')
+
+        if not channel:
+            return None
+        return channel.lower(), msg_id
+
+    def media_refs(self, entry) -> List[tuple]:
+        """All Telegram media references in an entry's description"""
+        refs = []
+        for match in IMG_RE.finditer(entry.get('description', '')):
+            ref = self.parse_media_ref(match.group(1))
+            if ref:
+                refs.append(ref)
+        return refs
+
+    async def resolve_entry_media(self, entries) -> Dict[tuple, str]:
+        """Resolve the media of several entries at once, one batch per source channel"""
+        by_channel: Dict[str, List[int]] = {}
+        for entry in entries:
+            for channel, msg_id in self.media_refs(entry):
+                by_channel.setdefault(channel, []).append(msg_id)
 
-    async def format_message(self, entry, channel_name):
+        results = await asyncio.gather(*(
+            self.resolve_media(channel, ids) for channel, ids in by_channel.items()
+        ))
+        media_urls = {}
+        for channel, urls in zip(by_channel, results):
+            for msg_id, url in urls.items():
+                media_urls[(channel, msg_id)] = url
+        return media_urls
+
+    async def format_message(self, entry, channel_name, media_urls: Optional[Dict[tuple, str]] = None) -> List[discord.Embed]:
+        content = entry.get('description', '')
+
+        # Leave room for the "+N more images" note when there's more than one image
+        limit = DESCRIPTION_LIMIT - 32 if content.count('<img') > 1 else DESCRIPTION_LIMIT
+        description = convert_description(content, limit=limit)
+
+        # Handle images
+        if media_urls is None:
+            media_urls = await self.resolve_entry_media([entry])
+
+        img_urls = []
+        for url in description.images:
+            ref = self.parse_media_ref(url)
+            if ref:
+                url = media_urls.get(ref)
+                if not url:
+                    continue
+
+            if url.startswith(('http://', 'https://')) and ' ' not in url and '\n' not in url:
+                img_urls.append(url)
+
+        post_date = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            post_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+
+        return self.build_embeds(channel_name, description.text, img_urls, post_date, description.forward_author,
+                                 link=entry.get('link'))
+
+    async def format_telegram_message(self, channel_name: str, messages, link: Optional[str] = None) -> List[discord.Embed]:
+        """Build an embed straight from a Telethon message, or the messages of one album"""
+        from telethon.extensions import html as telegram_html
+
+        # An album's caption sits on one of its messages, usually the first
+        captioned = next((message for message in messages if message.message), messages[0])
+        # Message text keeps plain newlines where the RSS bridge would have written <br>
+        content = telegram_html.unparse(captioned.message or '', captioned.entities or []).replace('\n', '<br>')
+        images = [message for message in messages if self.is_image(message)]
+        limit = DESCRIPTION_LIMIT - 32 if len(images) > 1 else DESCRIPTION_LIMIT
+        description = convert_description(content, limit=limit)
+
+        async def host(message):
+            cached = self.media_cache.get_message(channel_name.lower(), message.id)
+            if cached:
+                self.metrics.media_cache_hits.inc(kind="message")
+                return cached
+            async with self.media_semaphore:
+                with self.metrics.media_upload.time():
+                    return await self.host_media(channel_name.lower(), message)
+
+        img_urls = [url for url in await asyncio.gather(*(host(message) for message in images)) if url]
+
+        forward_author = None
+        forward = messages[0].forward
+        if forward:
+            forward_author = (
+                forward.from_name
+                or getattr(forward.chat, 'title', None)
+                or getattr(forward.sender, 'first_name', None)
+                or forward.post_author
+            )
+        return self.build_embeds(channel_name, description.text, img_urls, messages[0].date, forward_author, link=link)
+
+    def is_image(self, message) -> bool:
+        if message.photo:
+            return True
+        mime_type = message.file.mime_type if message.file else None
+        return bool(message.document and mime_type and mime_type.startswith('image/'))
+
+    def build_embeds(self, channel_name: str, text: str, img_urls: List[str], post_date: Optional[datetime] = None,
+                     forward_author: Optional[str] = None, link: Optional[str] = None) -> List[discord.Embed]:
+        """The embeds of one post: the post itself, then any gallery images"""
         embed = discord.Embed(color=self.color)
         
         channel_name = channel_name.capitalize()
@@ -259,181 +679,441 @@ class TelegramRSSBridge(commands.Cog):
             icon_url="https://telegram.org/img/t_logo.png"
         )
 
-        content = entry.get('description', '')
-        
         # Handle forwarded messages
-        forward_match = re.search(r'Forwarded From <b><a href="([^"]+)">([^<]+)</a></b> \(([^)]+)\)', content)
-        if forward_match:
-            forward_link, forward_channel, forward_author = forward_match.groups()
+        if forward_author:
             embed.set_footer(
                 text=f"Forwarded from {forward_author}",
                 icon_url="https://telegram.org/img/t_logo.png"
             )
 
-        # Remove forwarding header and clean content
-        clean_content = re.sub(r'Forwarded From.*?\)', '', content)
-        if self.is_spaced_text(clean_content):
-            clean_content = ''.join(clean_content.split())
-        clean_content = self.clean_text(clean_content)
-        if clean_content:
-            embed.description = clean_content
-
-        # Handle images
-        img_urls = []
-        img_matches = re.finditer(r'<img[^>]+src="([^"]+)"[^>]*>', content)
-        content_modified = content
-        
-        for match in img_matches:
-            url = match.group(1)
-            original_url = url
-            processed = False
-            
-            if 'undefined://' in url or 'undefined:' in url:
-                try:
-                    parts = url.split('/')
-                    msg_id_match = re.search(r'_(\d+)$', parts[-1])
-                    
-                    if not msg_id_match:
-                        continue
-                        
-                    msg_id = int(msg_id_match.group(1))
-                    
-                    channel = None
-                    if 'channel' in parts:
-                        channel_index = parts.index('channel')
-                        channel_part = '/'.join([p for i, p in enumerate(parts) if i > channel_index])
-                        channel_match = re.match(r'([^0-9]+)', channel_part)
-                        if channel_match:
-                            channel = channel_match.group(1).rstrip('_')
-                    
-                    if not channel:
-                        continue
-                    
-                    direct_url = await self.get_media_url(channel, msg_id)
-                    if direct_url:
-                        url = direct_url
-                        content_modified = content_modified.replace(original_url, url)
-                        processed = True
-                        
-                except Exception as e:
-                    print(f"Error processing undefined URL: {str(e)}")
-            
-            if url.startswith(('http://', 'https://')) and ' ' not in url and '\n' not in url:
-                img_urls.append(url)
-
-        content = content_modified
+        if text:
+            embed.description = text
 
+        gallery = []
         if img_urls:
             try:
                 url = img_urls[0]
                 embed.set_image(url=url)
             except Exception as e:
-                print(f"Error setting image URL: {str(e)}")
+                log.warning("could not set embed image url=%r error=%r", url, str(e))
+
+            extra_images = img_urls[1:]
+            if self.embed_gallery and link and extra_images:
+                embed.url = link
+                gallery = [discord.Embed(url=link).set_image(url=url) for url in extra_images[:GALLERY_SIZE - 1]]
+                extra_images = extra_images[GALLERY_SIZE - 1:]
             
-            if len(img_urls) > 1:
-                additional_images = len(img_urls) - 1
+            if extra_images:
+                additional_images = len(extra_images)
                 if embed.description:
                     embed.description += f"\n\n*+{additional_images} more image{'s' if additional_images > 1 else ''}*"
                 else:
                     embed.description = f"*+{additional_images} more image{'s' if additional_images > 1 else ''}*"
 
-        # Set timestamp
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            post_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+        if post_date:
             embed.timestamp = post_date
 
-        return embed
+        return [embed] + gallery
+
+    def can_publish(self, channel) -> bool:
+        """Whether messages sent to ``channel`` should be crossposted"""
+        if not (isinstance(channel, discord.TextChannel) and channel.is_news()):
+            return False
+        permissions = channel.permissions_for(channel.guild.me)
+        if not permissions.manage_messages:
+            log.warning("missing manage_messages permission channel=%s", channel.name)
+            return False
+        return True
+
+    async def get_destination(self, destination: Destination):
+        """The Discord channel or thread to send to, or None if it's gone"""
+        channel = self.bot.get_channel(destination.target_id)
+        if channel is None and destination.thread_id:
+            # Archived threads aren't cached; sending to one unarchives it
+            try:
+                channel = await self.bot.fetch_channel(destination.thread_id)
+            except discord.HTTPException as e:
+                log.warning("thread unavailable thread=%s error=%r", destination.thread_id, str(e))
+        return channel
+
+    async def fetch_feed(self, channel_name: str, keys: List[str]):
+        """Fetch and parse a channel's feed without blocking the event loop.
+
+        Returns an ``(entries, state)`` tuple, or ``None`` when the feed hasn't changed
+        since it was last processed. ``state`` holds the new validators and body hash
+        and should be committed with ``commit_feed_state`` once the feed is handled.
+        ``keys`` are the dedup keys of the channel's destinations.
+        Raises FeedFormatError if the feed can't be parsed at all.
+        """
+        rss_url = RSS_URL.format(channel_name=channel_name)
+        previous = self.feed_state.get(channel_name, {})
+        headers = {}
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+        async with self.fetch_semaphore:
+            with self.metrics.feed_fetch.time(channel=channel_name):
+                resp = await asyncio.to_thread(self.fetch_url, rss_url, headers)
+            if resp.status_code == 304:
+                self.metrics.feed_unchanged.inc(channel=channel_name)
+                return None
+
+            # Some bridges ignore validators, so fall back to comparing the body itself
+            body_hash = hashlib.sha256(resp.content).hexdigest()
+            if body_hash == previous.get("hash"):
+                self.metrics.feed_unchanged.inc(channel=channel_name)
+                return None
+
+            with self.metrics.feed_parse.time(channel=channel_name):
+                entries = await asyncio.to_thread(
+                    self.parse_feed, channel_name, resp.content, keys, previous.get("retry_from")
+                )
+
+        state = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "hash": body_hash,
+        }
+        return entries, state
+
+    def get_scraper(self):
+        """The calling thread's scraper session"""
+        scraper = getattr(self.scrapers, "session", None)
+        if scraper is None:
+            scraper = self.scrapers.session = self.create_scraper()
+        return scraper
+
+    def fetch_url(self, url: str, headers: dict):
+        """GET ``url`` with this thread's scraper; runs in a worker thread"""
+        return self.get_scraper().get(url, headers=headers, timeout=20)
 
-    @tasks.loop(minutes=5)
+    def parse_feed(self, channel_name: str, body: bytes, keys: List[str], rescan_from: Optional[float] = None) -> list:
+        """A feed's entries, newest-first, reading no further than the first post
+        every destination (by dedup key) already has.
+
+        Posts from ``rescan_from`` on are read even if known, since an older
+        one among them failed to send (see ``mark_for_retry``). Falls back to feedparser, which reads every entry, for anything the
+        streaming scanner can't handle.
+        """
+        try:
+            return scan_feed(
+                body, lambda link: all(self.posted_links.contains(key, link) for key in keys), self.since_date,
+                rescan_from,
+            )
+        except FeedFormatError as e:
+            log.info("falling back to feedparser channel=%s error=%r", channel_name, str(e))
+
+        import feedparser
+        feed = feedparser.parse(body)
+        if feed.bozo and not feed.entries:
+            raise FeedFormatError(str(feed.get("bozo_exception", "unparseable feed")))
+        return feed.entries
+
+    def mark_for_retry(self, channel_name: str, published: float):
+        """Make the next polls read the feed back to a post that failed to send.
+
+        Newer posts may already be remembered, which would otherwise end the
+        scan before reaching it. The feed's previous validators are kept, and
+        the next fully handled poll commits a state without the marker.
+        """
+        state = dict(self.feed_state.get(channel_name, {}))
+        if state.get("retry_from") is None or published < state["retry_from"]:
+            state["retry_from"] = published
+            self.commit_feed_state(channel_name, state)
+
+    def commit_feed_state(self, channel_name: str, state: dict):
+        self.feed_state[channel_name] = state
+        if self.shard is not None:
+            self.shard.feed_state(channel_name, state)
+        else:
+            self.feed_state_dirty = True
+
+    async def deliver_shard_post(self, channel_id: int, embed_dicts: List[dict], newer: Optional[int] = None
+                                 ) -> discord.Message:
+        """Send a post built by a shard worker to a channel or thread.
+
+        ``newer`` is how many newer posts the worker is sending the destination
+        in the same poll, or None if the post shouldn't be published. As when
+        polling in-process, the crosspost budget goes to the newest posts.
+        """
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            # Possibly an archived thread
+            channel = await self.bot.fetch_channel(channel_id)
+        embeds = [discord.Embed.from_dict(embed_dict) for embed_dict in embed_dicts]
+        publish = newer is not None and self.can_publish(channel) and newer < self.sender.crosspost_budget(channel.id)
+        return await self.sender.send(channel, publish=publish, embeds=embeds)
+
+    @tasks.loop(seconds=15)
     async def check_rss(self):
-        for channel_name, discord_channel_id in self.channel_mappings.items():
+        # Ticks are frequent; the poll scheduler decides which channels are actually due
+        self.posted_links.prune()
+        # Each poll runs as its own task, so a channel catching up on a long
+        # backlog doesn't hold up the next tick for everyone else
+        for channel_name in self.poll_scheduler.due(busy=self.poll_tasks):
+            task = asyncio.create_task(self.poll_channel(channel_name, self.channel_mappings[channel_name]))
+            self.poll_tasks[channel_name] = task
+            task.add_done_callback(lambda _, name=channel_name: self.poll_tasks.pop(name, None))
+        # Compacting runs on the loop so no append can slip in between the
+        # snapshot and the journal truncation; it only happens every few hundred posts
+        if self.shard is None and self.posted_links_journal.pending >= self.journal_compact_threshold:
+            self.save_posted_links()
+        if self.feed_state_dirty:
+            self.save_feed_state()
+        # The snapshot is taken here on the loop; serialising and writing
+        # thousands of entries happens in a thread
+        media = self.media_cache.snapshot()
+        if media is not None:
+            await asyncio.to_thread(self.media_cache.write, media)
+        if self.shards:
+            self.shards.check()
+
+    async def poll_channel(self, channel_name: str, destinations: List[Destination]):
+        claimed = set()
+        try:
+            targets = []
+            for destination in destinations:
+                channel = await self.get_destination(destination)
+                if channel:
+                    targets.append((destination, destination.dedup_key(channel_name), channel))
+            if not targets:
+                # Nothing was fetched, so the request budget goes to the next channel
+                self.poll_scheduler.refund()
+                self.poll_scheduler.record_failure(channel_name, "no destination")
+                return
+
             try:
-                if channel_name not in self.posted_links:
-                    self.posted_links[channel_name] = []
-
-                rss_url = f"https://rss.tabithahanegan.com/telegram/channel/{channel_name}"
-                resp = self.scraper.get(rss_url, timeout=20)
-                feed = feedparser.parse(resp.content)
-                
-                channel = self.bot.get_channel(int(discord_channel_id))
-                if not channel:
-                    continue
+                result = await self.fetch_feed(channel_name, [key for _, key, _ in targets])
+            except FeedFormatError as e:
+                log.warning("feed unparseable channel=%s error=%r", channel_name, str(e))
+                self.metrics.poll_errors.inc(channel=channel_name, stage="parse")
+                self.poll_scheduler.record_failure(channel_name, str(e))
+                return
+            except Exception as e:
+                log.warning("feed fetch failed channel=%s error=%r", channel_name, str(e))
+                self.metrics.poll_errors.inc(channel=channel_name, stage="fetch")
+                self.poll_scheduler.record_failure(channel_name, str(e))
+                return
+            if result is None:
+                self.poll_scheduler.record_success(channel_name)
+                return
+            entries, feed_state = result
+            self.poll_scheduler.record_success(channel_name, (
+                calendar.timegm(entry.published_parsed)
+                for entry in entries
+                if entry.get('published_parsed')
+            ))
+
+            since_date = self.since_date
+            if since_date is not None and since_date.tzinfo is None:
+                since_date = since_date.replace(tzinfo=timezone.utc)
 
-                # Get the latest post's date from our posted links
-                latest_post_date = None
-                for entry in feed.entries:
-                    if entry.link in self.posted_links[channel_name]:
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            post_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-                            if latest_post_date is None or post_date > latest_post_date:
-                                latest_post_date = post_date
-
-                # Process all posts that we haven't seen before
-                new_entries = []
-                for entry in feed.entries:
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        post_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-                        if entry.link not in self.posted_links[channel_name]:
-                            new_entries.append((post_date, entry))
-
-                # Sort new entries by date, newest first for publishing
-                new_entries.sort(key=lambda x: x[0], reverse=True)
-                
-                # Only publish the 10 most recent posts to respect Discord's rate limit
-                posts_to_publish = new_entries[:10] if len(new_entries) > 10 else new_entries
-                # Resort to chronological order for posting
-                posts_to_publish.sort(key=lambda x: x[0])
-
-                # Process new entries
-                for post_date, entry in posts_to_publish:
-                    try:
-                        embed = await self.format_message(entry, channel_name)
-                        message = await channel.send(embed=embed)
-                        
-                        # If this is an announcement channel, publish the message
-                        if isinstance(channel, discord.TextChannel) and channel.is_news():
-                            # Check permissions first
-                            permissions = channel.permissions_for(channel.guild.me)
-                            if not permissions.manage_messages:
-                                print(f"Bot lacks manage_messages permission in channel {channel.name}")
-                                continue
-                                
-                            try:
-                                await message.publish()
-                                print(f"Successfully published message in announcement channel {channel.name}")
-                            except discord.Forbidden:
-                                print(f"Missing permissions to publish in announcement channel {channel.name}")
-                            except discord.HTTPException as e:
-                                print(f"HTTP error when publishing in announcement channel {channel.name}: {str(e)}")
-                            except Exception as e:
-                                print(f"Unexpected error when publishing in announcement channel {channel.name}: {str(e)}")
-                                
-                        self.posted_links[channel_name].append(entry.link)
-                        self.save_posted_links()
-                        await asyncio.sleep(1)
-                    except Exception as e:
-                        print(f"Error processing entry: {str(e)}")
+            # Process all posts that some destination hasn't seen before
+            new_entries = []
+            busy = False
+            for entry in entries:
+                if entry.get('published_parsed'):
+                    post_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+                    if since_date and post_date < since_date:
                         continue
-                        
-                # Process remaining entries without publishing
-                if len(new_entries) > 10:
-                    for post_date, entry in new_entries[10:]:
-                        try:
-                            embed = await self.format_message(entry, channel_name)
-                            await channel.send(embed=embed)
-                            self.posted_links[channel_name].append(entry.link)
-                            self.save_posted_links()
-                            await asyncio.sleep(1)
-                        except Exception as e:
-                            print(f"Error processing entry: {str(e)}")
-                            continue
+                    wanted = []
+                    for target in targets:
+                        key = target[1]
+                        if (key, entry.link) in self.in_flight:
+                            # Already on its way through a Telegram update
+                            busy = True
+                        elif not self.posted_links.contains(key, entry.link):
+                            wanted.append(target)
+                    if wanted:
+                        new_entries.append((post_date, entry, wanted))
+            claimed = {(key, entry.link) for _, entry, wanted in new_entries for _, key, _ in wanted}
+            self.in_flight |= claimed
 
-            except Exception:
+            # Post in chronological order
+            new_entries.sort(key=lambda x: x[0])
+
+            # Resolve the media of every new entry up front, one batch per source channel
+            media_urls = await self.resolve_entry_media(entry for _, entry, _ in new_entries)
+
+            # Crossposting is limited per hour, so each destination spends what's
+            # left of its budget on its newest posts
+            remaining = Counter(key for _, _, wanted in new_entries for _, key, _ in wanted)
+            budgets = {
+                key: self.sender.crosspost_budget(channel.id)
+                for destination, key, channel in targets
+                if destination.publish and self.can_publish(channel)
+            }
+
+            failed = False
+            # Publish time of the oldest post that didn't make it out
+            oldest_failure = None
+            sends = []
+            for post_date, entry, wanted in new_entries:
+                # Formatted once, however many destinations it goes to
+                try:
+                    with self.metrics.format.time():
+                        embeds = await self.format_message(entry, channel_name, media_urls)
+                except Exception:
+                    log.exception("formatting failed channel=%s link=%s", channel_name, entry.link)
+                    failed = True
+                    oldest_failure = min(oldest_failure or post_date, post_date)
+                    continue
+                for destination, key, channel in wanted:
+                    remaining[key] -= 1
+                    if self.shard is not None:
+                        # Only the coordinator knows the crosspost budget, so it makes the call
+                        send = self.sender.send(channel, embeds=embeds,
+                                                newer=remaining[key] if destination.publish else None)
+                    else:
+                        send = self.sender.send(channel, publish=remaining[key] < budgets.get(key, 0), embeds=embeds)
+                    sends.append((entry, key, send))
+
+            for entry, key, send in sends:
+                try:
+                    await send
+                    self.record_posted(key, entry.link)
+                    self.metrics.posts_sent.inc(channel=channel_name, source="rss")
+                except Exception as e:
+                    log.warning("send failed destination=%s link=%s error=%r", key, entry.link, str(e))
+                    self.metrics.send_errors.inc(channel=channel_name)
+                    failed = True
+                    post_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+                    oldest_failure = min(oldest_failure or post_date, post_date)
+
+            # Only remember the validators once the feed has been handled, so a tick that
+            # fails halfway through is retried instead of being skipped as unchanged
+            if not (failed or busy):
+                self.commit_feed_state(channel_name, feed_state)
+            elif oldest_failure:
+                self.mark_for_retry(channel_name, oldest_failure.timestamp())
+            if sends:
+                log.info("posted channel=%s new=%s sent=%s", channel_name, len(new_entries), len(sends))
+
+        except Exception:
+            log.exception("poll failed channel=%s", channel_name)
+            self.metrics.poll_errors.inc(channel=channel_name, stage="poll")
+        finally:
+            self.in_flight -= claimed
+
+    async def start_push(self):
+        """Subscribe to new posts of the channels this process polls.
+
+        Posts then arrive as Telegram updates within seconds, and RSS polling
+        of those channels drops to a reconciliation pass every
+        ``push_reconcile_seconds``. The Telegram account must be able to see
+        the channels' updates (a bot has to be added to each channel).
+        """
+        from telethon import events, utils
+
+        for channel_name in self.poll_scheduler.channels:
+            try:
+                entity = await self.get_channel_entity(channel_name)
+            except Exception as e:
+                # Unknown usernames, private channels (RPCError), dropped connections...
+                # none of them should cost the other channels their push updates
+                log.warning("push unavailable channel=%s error=%r", channel_name, str(e) or type(e).__name__)
                 continue
+            if entity is not None:
+                peer_id = utils.get_peer_id(entity)
+                self.push_channels[peer_id] = channel_name
+                self.push_usernames[peer_id] = getattr(entity, 'username', None) or channel_name
+        if not self.push_channels:
+            return
+
+        chats = list(self.push_channels)
+        self.tg_client.add_event_handler(self.on_telegram_message, events.NewMessage(chats=chats))
+        self.tg_client.add_event_handler(self.on_telegram_album, events.Album(chats=chats))
+        self.poll_scheduler.set_pushed(self.push_channels.values())
+        log.info("push mode enabled channels=%d", len(self.push_channels))
+
+    async def on_telegram_message(self, event):
+        if event.message.grouped_id:
+            # Albums arrive once more, complete, through on_telegram_album
+            return
+        await self.push_post([event.message])
+
+    async def on_telegram_album(self, event):
+        await self.push_post(sorted(event.messages, key=lambda message: message.id))
+
+    async def push_post(self, messages):
+        """Post a message (or album) that Telegram pushed to us"""
+        channel_name = self.push_channels.get(messages[0].chat_id)
+        if channel_name is None:
+            return
+        # The same link the RSS bridge gives the post, so either path dedups the other.
+        # The bridge writes the username's real capitalisation, which mappings.json may not.
+        link = f"https://t.me/{self.push_usernames[messages[0].chat_id]}/{messages[0].id}"
+        claimed = set()
+        try:
+            targets = []
+            for destination in self.channel_mappings.get(channel_name, []):
+                key = destination.dedup_key(channel_name)
+                if (key, link) in self.in_flight or self.posted_links.contains(key, link):
+                    continue
+                # Claimed before the lookup below can yield, so a poll doesn't send it too
+                claimed.add((key, link))
+                self.in_flight.add((key, link))
+                channel = await self.get_destination(destination)
+                if channel:
+                    targets.append((destination, key, channel))
+            if not targets:
+                return
+
+            with self.metrics.format.time():
+                embeds = await self.format_telegram_message(channel_name, messages, link)
+            sends = []
+            for destination, key, channel in targets:
+                if self.shard is not None:
+                    send = self.sender.send(channel, embeds=embeds, newer=0 if destination.publish else None)
+                else:
+                    publish = (
+                        destination.publish and self.can_publish(channel) and self.sender.crosspost_budget(channel.id) > 0
+                    )
+                    send = self.sender.send(channel, publish=publish, embeds=embeds)
+                sends.append((key, send))
+            for key, send in sends:
+                try:
+                    await send
+                    self.record_posted(key, link)
+                    self.metrics.posts_sent.inc(channel=channel_name, source="push")
+                except Exception as e:
+                    # The next reconciliation poll picks the post up from RSS instead
+                    log.warning("push send failed destination=%s link=%s error=%r", key, link, str(e))
+                    self.metrics.send_errors.inc(channel=channel_name)
+                    self.mark_for_retry(channel_name, messages[0].date.timestamp())
+        except Exception:
+            log.exception("push failed channel=%s link=%s", channel_name, link)
+            self.metrics.send_errors.inc(channel=channel_name)
+            self.mark_for_retry(channel_name, messages[0].date.timestamp())
+        finally:
+            self.in_flight -= claimed
 
     @check_rss.before_loop
     async def before_check_rss(self):
         await self.bot.wait_until_ready()
+        try:
+            await self.start_bridge()
+        except Exception as e:
+            # The loop task ends here, and nothing would ever surface the error otherwise
+            log.exception("bridge failed to start")
+            self.startup_error = e
+            raise
+        finally:
+            self.startup_done.set()
+        # Connect and authorize once up front instead of on the first media lookup
+        if self.poll_scheduler.channels:
+            try:
+                if await self.start_telegram_client() and self.keys.get("telegram_push", False):
+                    await self.start_push()
+            except Exception:
+                log.exception("telegram client failed to start")
+        if self.metrics_port and self.metrics_runner is None:
+            try:
+                self.metrics_runner = await start_metrics_server(self.metrics.registry, "127.0.0.1", self.metrics_port)
+            except OSError as e:
+                log.error("metrics endpoint failed to start port=%s error=%r", self.metrics_port, str(e))
 
     @commands.group(name="telegram")
     @commands.has_permissions(manage_messages=True)
@@ -441,71 +1121,123 @@ class TelegramRSSBridge(commands.Cog):
         """Commands for managing Telegram bridge posts"""
         if ctx.invoked_subcommand is None:
             await ctx.send("Please specify a subcommand. Use `help telegram` for more information.")
+    @telegram_group.command(name="schedule")
+    async def show_schedule(self, ctx):
+        """Show when each channel's feed will be polled next"""
+        now = time.time()
+        lines = []
+        for name, schedule in sorted(self.poll_scheduler.channels.items(), key=lambda item: item[1].next_poll):
+            wait = max(schedule.next_poll - now, 0)
+            line = f"**{name}** in {int(wait // 60)}m {int(wait % 60)}s (every ~{int(schedule.interval // 60)}m"
+            if schedule.pushed:
+                line += ", pushed"
+            if schedule.failures:
+                line += f", {schedule.failures} failures: {schedule.last_error}"
+            lines.append(line + ")")
+
+        embed = discord.Embed(title="Feed Poll Schedule", color=self.color)
+        embed.description = "\n".join(lines)[:DESCRIPTION_LIMIT] or "No channels mapped"
+        await ctx.send(embed=embed)
+
+    @telegram_group.command(name="stats")
+    async def show_stats(self, ctx):
+        """Show bridge latencies and per-channel counters"""
+        metrics = self.metrics
+        timings = []
+        for label, histogram in (
+            ("Feed fetch", metrics.feed_fetch),
+            ("Feed parse", metrics.feed_parse),
+            ("Format", metrics.format),
+            ("Media lookup", metrics.media_resolve),
+            ("Media upload", metrics.media_upload),
+            ("Discord send", metrics.send),
+            ("Discord publish", metrics.publish),
+        ):
+            count, mean = histogram.summary()
+            timings.append(f"**{label}**: {count} × {mean * 1000:.0f} ms avg")
+
+        pending = await asyncio.to_thread(self.pending_posts.counts)
+        channels = []
+        for channel_name, destinations in sorted(self.channel_mappings.items()):
+            remembered = min(
+                self.posted_links.channel_size(destination.dedup_key(channel_name)) for destination in destinations
+            )
+            queued = sum(self.sender.backlog(destination.target_id) for destination in destinations)
+            channels.append(
+                f"**{channel_name}** → {len(destinations)}: {int(metrics.posts_sent.total(channel=channel_name))} sent, "
+                f"{int(metrics.poll_errors.total(channel=channel_name))} errors, "
+                f"{remembered} remembered, {queued} queued, {pending.get(channel_name, 0)} pending"
+            )
+
+        embed = discord.Embed(title="Bridge Stats", color=self.color)
+        embed.add_field(name="Latency", value="\n".join(timings), inline=False)
+        embed.description = "\n".join(channels)[:DESCRIPTION_LIMIT] or "No channels mapped"
+        await ctx.send(embed=embed)
+
     @telegram_group.command(name="pending")
     async def list_pending(self, ctx, channel_name: Optional[str] = None):
         """List pending posts for a channel or all channels"""
-        if channel_name and channel_name not in self.pending_posts:
-            await ctx.send(f"No pending posts found for channel {channel_name}")
+        counts = await asyncio.to_thread(self.pending_posts.counts)
+        if channel_name:
+            if channel_name not in counts:
+                await ctx.send(f"No pending posts found for channel {channel_name}")
+                return
+            counts = {channel_name: counts[channel_name]}
+        if not counts:
+            await ctx.send("No pending posts")
             return
 
-        channels_to_check = [channel_name] if channel_name else self.pending_posts.keys()
-        
-        for chan in channels_to_check:
-            if not self.pending_posts[chan]:
-                continue
-                
-            embed = discord.Embed(
-                title=f"Pending Posts for {chan}",
-                color=self.color
-            )
-            
-            for i, post in enumerate(self.pending_posts[chan]):
-                post_date = datetime.fromisoformat(post["post_date"]).strftime("%Y-%m-%d %H:%M UTC")
-                embed.add_field(
-                    name=f"Post #{i+1}",
-                    value=f"Posted at: {post_date}\nLink: {post['link']}",
-                    inline=False
-                )
-            
-            await ctx.send(embed=embed)
+        view = PendingListView(self.pending_posts, counts, ctx.author.id, self.color)
+        view.message = await ctx.send(embed=await view.render(), view=view)
 
     @telegram_group.command(name="publish")
     async def publish_posts(self, ctx, channel_name: str, count: int = 1):
         """Publish specified number of pending posts for a channel"""
-        if channel_name not in self.pending_posts:
-            await ctx.send(f"No pending posts found for channel {channel_name}")
+        if count < 1:
+            await ctx.send("The number of posts to publish must be at least 1")
             return
-
-        if not self.pending_posts[channel_name]:
+        posts_to_publish = await asyncio.to_thread(self.pending_posts.page, channel_name, 0, count)
+        if not posts_to_publish:
             await ctx.send(f"No pending posts available for {channel_name}")
             return
 
-        posts_to_publish = self.pending_posts[channel_name][:count]
-        self.pending_posts[channel_name] = self.pending_posts[channel_name][count:]
-        
+        # Posts stay queued until they're sent, so a failure leaves them to publish again later
+        sends = []
         for post in posts_to_publish:
-            channel = self.bot.get_channel(int(post["channel_id"]))
-            if channel:
-                try:
-                    embed = discord.Embed.from_dict(post["embed_dict"])
-                    await channel.send(embed=embed)
-                    self.posted_links[channel_name].append(post["link"])
-                    await asyncio.sleep(1)
-                except Exception:
-                    continue
+            try:
+                channel = self.bot.get_channel(int(post["channel_id"]))
+                if channel is None:
+                    channel = await self.bot.fetch_channel(int(post["channel_id"]))
+                embed = discord.Embed.from_dict(post["embed_dict"])
+            except Exception as e:
+                log.warning("pending post unsendable channel=%s link=%s error=%r", channel_name, post["link"], str(e))
+                self.metrics.send_errors.inc(channel=channel_name)
+                continue
+            sends.append((post, self.sender.send(channel, embed=embed)))
+
+        published = []
+        for post, send in sends:
+            try:
+                await send
+                self.record_posted(Destination(int(post["channel_id"])).dedup_key(channel_name), post["link"])
+                self.metrics.posts_sent.inc(channel=channel_name, source="pending")
+                published.append(post["link"])
+            except Exception as e:
+                log.warning("send failed channel=%s link=%s error=%r", channel_name, post["link"], str(e))
+                self.metrics.send_errors.inc(channel=channel_name)
+        await asyncio.to_thread(self.pending_posts.remove, channel_name, published)
 
-        self.save_pending_posts()
-        self.save_posted_links()
-        await ctx.send(f"Published {len(posts_to_publish)} posts for {channel_name}")
+        message = f"Published {len(published)} posts for {channel_name}"
+        if len(published) < len(posts_to_publish):
+            message += f"; {len(posts_to_publish) - len(published)} failed and are still pending"
+        await ctx.send(message)
 
     @telegram_group.command(name="clear")
     async def clear_pending(self, ctx, channel_name: str):
         """Clear all pending posts for a channel"""
-        if channel_name not in self.pending_posts:
+        post_count = await asyncio.to_thread(self.pending_posts.clear, channel_name)
+        if not post_count:
             await ctx.send(f"No pending posts found for channel {channel_name}")
             return
 
-        post_count = len(self.pending_posts[channel_name])
-        self.pending_posts[channel_name] = []
-        self.save_pending_posts()
         await ctx.send(f"Cleared {post_count} pending posts for {channel_name}")
@@ -4,6 +4,7 @@
 
 
 import os
+import logging
 import platform
 import discord
 import json
@@ -15,6 +16,8 @@ from cogs.telegram import TelegramRSSBridge
 from discord.ext import tasks
 from discord.ext import commands
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
 # Load keys from keys.json
 with open('keys.json', 'r') as f:
     keys = json.load(f)
@@ -39,10 +42,13 @@ async def on_ready():
   print("Python " + platform.python_version())
   print("Py-Cord " + discord.__version__)
 
-# From Telegram
-bot.add_cog(TelegramRSSBridge(bot))
-bot.add_cog(Base(bot))
+# Shard workers are spawned processes that import this module again, so
+# only the parent process may start the bot
+if __name__ == "__main__":
+  # From Telegram
+  bot.add_cog(TelegramRSSBridge(bot, keys=keys))
+  bot.add_cog(Base(bot))
 
-# Get Discord token from keys.json
-TOKEN = keys.get("discord_token")
-bot.run(TOKEN)
\ No newline at end of file
+  # Get Discord token from keys.json
+  TOKEN = keys.get("discord_token")
+  bot.run(TOKEN)
\ No newline at end of file